@@ -0,0 +1,98 @@
+"""Throughput benchmark for the MCP Parks Info Server.
+
+Starts N concurrent MCP clients, each with its own SSE session (like N ReAct
+agents sharing one server), and reports aggregate tool-call throughput and
+latency percentiles for every concurrency level.
+
+Usage:
+    uvicorn server:app --host 0.0.0.0 --port 8007
+    python bench.py --url http://localhost:8007/sse --concurrency 1 8 32
+
+    MCP_TRANSPORT=streamable-http uvicorn server:app --port 8007 --workers 4
+    python bench.py --transport streamable-http --url http://localhost:8007/mcp
+
+Start the server with PARK_CACHE_MAXSIZE=0 so that repeated calls measure the
+RAG path rather than the result cache. The default tool, get_park_location,
+is not answered from the parks database.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from contextlib import asynccontextmanager
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+DEFAULT_PARKS = [
+    "Azure Mangrove Wilderness",
+    "Crimson Basin Desert Preserve",
+    "Granite Spire Alpine Sanctuary",
+    "Obsidian Rainforest Reserve",
+    "Prismatic Painted Prairie",
+]
+
+
+@asynccontextmanager
+async def _connect(url: str, transport: str):
+    if transport == "streamable-http":
+        async with streamablehttp_client(url) as (read_stream, write_stream, _get_session_id):
+            yield read_stream, write_stream
+    else:
+        async with sse_client(url) as (read_stream, write_stream):
+            yield read_stream, write_stream
+
+
+async def _caller(url: str, transport: str, tool: str, calls: int, offset: int, latencies: list) -> None:
+    async with _connect(url, transport) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            for i in range(calls):
+                park_name = DEFAULT_PARKS[(offset + i) % len(DEFAULT_PARKS)]
+                start = time.perf_counter()
+                result = await session.call_tool(tool, {"park_name": park_name})
+                latencies.append(time.perf_counter() - start)
+                if result.isError:
+                    raise RuntimeError(f"{tool}({park_name!r}) failed: {result.content}")
+
+
+async def run_level(url: str, transport: str, tool: str, concurrency: int, calls_per_caller: int) -> dict:
+    """Run one concurrency level and return its throughput and latency summary."""
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(_caller(url, transport, tool, calls_per_caller, offset, latencies) for offset in range(concurrency))
+    )
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "calls": len(latencies),
+        "elapsed_s": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8007/sse", help="SSE or streamable HTTP endpoint of the MCP server")
+    parser.add_argument("--transport", choices=["sse", "streamable-http"], default="sse", help="MCP transport of the server")
+    parser.add_argument("--tool", default="get_park_location", help="Park tool to call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Concurrent callers per level")
+    parser.add_argument("--calls-per-caller", type=int, default=5, help="Sequential calls made by each caller")
+    args = parser.parse_args()
+
+    print(f"{'callers':>8} {'calls':>6} {'elapsed s':>10} {'calls/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for concurrency in args.concurrency:
+        res = asyncio.run(run_level(args.url, args.transport, args.tool, concurrency, args.calls_per_caller))
+        print(
+            f"{res['concurrency']:>8} {res['calls']:>6} {res['elapsed_s']:>10.2f} "
+            f"{res['throughput']:>9.2f} {res['p50_ms']:>9.1f} {res['p95_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
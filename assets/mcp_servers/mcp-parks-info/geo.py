@@ -0,0 +1,97 @@
+"""Nearest-park lookups over the coordinates in the Parks markdown corpus.
+
+Park coordinates are parsed once into NumPy arrays, so a query is a single
+vectorized haversine pass. Corpora above ``KD_TREE_MIN_PARKS`` parks are
+indexed with a SciPy KD-tree when it is installed.
+"""
+import glob
+import math
+import os
+import re
+
+import numpy as np
+
+from park_names import DEFAULT_PARKS_DOCS_PATH
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Below this many parks a full haversine pass is faster than a tree query
+KD_TREE_MIN_PARKS = 2048
+
+_COORDINATES_RE = re.compile(r"\*\*coordinates:?\*\*:?\s*\[\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*\]", re.IGNORECASE)
+
+
+def read_park_coordinates(docs_path: str = DEFAULT_PARKS_DOCS_PATH) -> list[tuple[str, float, float]]:
+    """Return ``(park, lat, lon)`` for every park document with a ``**coordinates** [lat, lon]`` line."""
+    parks = []
+    for path in sorted(glob.glob(os.path.join(docs_path, "*.md"))):
+        with open(path, encoding="utf-8") as f:
+            markdown = f.read()
+        title = next((line[2:].strip() for line in markdown.splitlines() if line.startswith("# ")), None)
+        match = _COORDINATES_RE.search(markdown)
+        if title and match:
+            parks.append((title, float(match.group(1)), float(match.group(2))))
+    return parks
+
+
+def _unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+class ParkLocationIndex:
+    """Great-circle nearest-neighbour index over park coordinates."""
+
+    def __init__(self, parks: list[tuple[str, float, float]]):
+        self.names = [name for name, _lat, _lon in parks]
+        self.lat = np.array([lat for _name, lat, _lon in parks], dtype=float)
+        self.lon = np.array([lon for _name, _lat, lon in parks], dtype=float)
+        self._lat_rad = np.radians(self.lat)
+        self._lon_rad = np.radians(self.lon)
+        self._cos_lat = np.cos(self._lat_rad)
+        self._tree = None
+        if cKDTree is not None and len(parks) >= KD_TREE_MIN_PARKS:
+            # Chord distance between unit vectors orders points like great-circle distance
+            self._tree = cKDTree(_unit_vectors(self.lat, self.lon))
+
+    @classmethod
+    def from_corpus(cls, docs_path: str = DEFAULT_PARKS_DOCS_PATH) -> "ParkLocationIndex":
+        return cls(read_park_coordinates(docs_path))
+
+    def distances_km(self, lat: float, lon: float, indexes=slice(None)) -> np.ndarray:
+        """Return the haversine distance from ``(lat, lon)`` to the selected parks."""
+        lat_rad, lon_rad = math.radians(lat), math.radians(lon)
+        a = (
+            np.sin((self._lat_rad[indexes] - lat_rad) / 2) ** 2
+            + math.cos(lat_rad) * self._cos_lat[indexes] * np.sin((self._lon_rad[indexes] - lon_rad) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def nearest(self, lat: float, lon: float, k: int = 3) -> list[dict]:
+        """Return the ``k`` parks closest to ``(lat, lon)``, nearest first."""
+        k = min(k, len(self.names))
+        if k <= 0:
+            return []
+        if self._tree is not None:
+            _chords, indexes = self._tree.query(_unit_vectors(np.array([lat]), np.array([lon]))[0], k=k)
+            indexes = np.atleast_1d(indexes)
+            distances = self.distances_km(lat, lon, indexes)
+        else:
+            distances = self.distances_km(lat, lon)
+            indexes = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+            distances = distances[indexes]
+        order = np.argsort(distances)
+        return [
+            {
+                "park": self.names[i],
+                "lat": float(self.lat[i]),
+                "lon": float(self.lon[i]),
+                "distance_km": round(float(d), 1),
+            }
+            for i, d in zip(np.asarray(indexes)[order], distances[order])
+        ]
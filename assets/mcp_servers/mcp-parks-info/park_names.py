@@ -0,0 +1,129 @@
+"""Fuzzy resolution of user-supplied park names to canonical corpus names.
+
+The index is built once from the ``parks.name`` column and the titles and
+file names of the Parks markdown documents. Lookups compare the query against
+each alias by token containment, character trigram overlap and edit distance,
+so misspellings like "Azure Mongrove" and extra words like "Park" resolve
+without a downstream call.
+"""
+import glob
+import os
+import re
+
+DEFAULT_PARKS_DOCS_PATH = os.environ.get(
+    "PARKS_DOCS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Parks"),
+)
+
+# Minimum similarity for a name to resolve to a park
+DEFAULT_MIN_SCORE = 0.6
+
+# Generic words that do not help tell parks apart
+_STOP_WORDS = {"the", "of", "park", "parks", "national", "state"}
+
+
+def _tokens(name: str) -> list[str]:
+    return [token for token in re.sub(r"[^a-z0-9]+", " ", name.lower()).split() if token not in _STOP_WORDS]
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_ratio(a: str, b: str) -> float:
+    """Return ``1 - levenshtein(a, b) / max(len(a), len(b))``."""
+    if not a or not b:
+        return 0.0
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return 1 - previous[-1] / max(len(a), len(b))
+
+
+def read_doc_titles(docs_path: str = DEFAULT_PARKS_DOCS_PATH) -> dict[str, str]:
+    """Return ``{title: file stem}`` for every markdown document under ``docs_path``."""
+    titles = {}
+    for path in sorted(glob.glob(os.path.join(docs_path, "*.md"))):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("# "):
+                    titles[line[2:].strip()] = os.path.splitext(os.path.basename(path))[0]
+                    break
+    return titles
+
+
+class ParkNameIndex:
+    """Precomputed trigram and token index over park name aliases."""
+
+    def __init__(self, aliases: dict[str, str], min_score: float = DEFAULT_MIN_SCORE):
+        """``aliases`` maps every known spelling of a park to its canonical name."""
+        self.min_score = min_score
+        self.names = sorted(set(aliases.values()))
+        self._entries = []
+        self._exact = {}
+        for alias, canonical in aliases.items():
+            tokens = _tokens(alias)
+            text = " ".join(tokens)
+            if text:
+                self._entries.append((canonical, text, set(tokens), _trigrams(text)))
+                self._exact[text] = canonical
+        self._resolved = {}
+
+    @classmethod
+    def build(cls, park_names=(), docs_path: str = DEFAULT_PARKS_DOCS_PATH) -> "ParkNameIndex":
+        """Build the index from database park names and the markdown corpus."""
+        aliases = {name: name for name in park_names}
+        for title, stem in read_doc_titles(docs_path).items():
+            aliases.setdefault(title, title)
+            aliases[stem.replace("_", " ")] = aliases[title]
+        return cls(aliases)
+
+    def _score(self, tokens: set[str], trigrams: set[str], entry) -> float:
+        _canonical, _alias_text, alias_tokens, alias_trigrams = entry
+        if tokens and (tokens <= alias_tokens or alias_tokens <= tokens):
+            return 1.0
+        return 2 * len(trigrams & alias_trigrams) / (len(trigrams) + len(alias_trigrams))
+
+    def candidates(self, park_name: str, k: int = 3) -> list[tuple[str, float]]:
+        """Return up to ``k`` ``(canonical name, score)`` pairs, best first."""
+        tokens = _tokens(park_name)
+        text = " ".join(tokens)
+        if not text:
+            return []
+        token_set, trigrams = set(tokens), _trigrams(text)
+        scored = sorted(
+            ((self._score(token_set, trigrams, entry), entry) for entry in self._entries),
+            key=lambda item: -item[0],
+        )
+        # Edit distance is only worth its cost for the closest few aliases,
+        # and only when no alias already contains the query
+        exact_hit = scored and scored[0][0] == 1.0
+        best = {}
+        for rank, (score, (canonical, alias_text, _alias_tokens, _alias_trigrams)) in enumerate(scored):
+            if not exact_hit and rank < k:
+                if len(text) < len(alias_text):
+                    score = max(score, 0.95 * _edit_ratio(text, alias_text[:len(text)]))
+                else:
+                    score = max(score, _edit_ratio(text, alias_text))
+            if score > best.get(canonical, -1.0):
+                best[canonical] = score
+        return sorted(best.items(), key=lambda item: -item[1])[:k]
+
+    def resolve(self, park_name: str) -> str | None:
+        """Return the canonical park name, or None if nothing matches closely enough."""
+        text = " ".join(_tokens(park_name))
+        if text in self._exact:
+            return self._exact[text]
+        if text not in self._resolved:
+            top = self.candidates(park_name, k=2)
+            resolved = None
+            if top and top[0][1] >= self.min_score and (len(top) == 1 or top[1][1] < top[0][1]):
+                resolved = top[0][0]
+            if len(self._resolved) >= 4096:
+                self._resolved.clear()
+            self._resolved[text] = resolved
+        return self._resolved[text]
@@ -0,0 +1,56 @@
+"""Section splitting shared by the local retriever and src/parks_ingest.py.
+
+Both the in-process index and the vector DB ingestion cut the Parks markdown
+along the same ``##`` sections and tag them with the same facets, so a tool
+retrieves the same text whichever RAG path answers it. This module has no
+dependencies so the notebook-side ingestion can load it by path.
+"""
+
+# Facet tag for each section heading used in the Parks documents
+SECTION_FACETS = {
+    "overview": "details",
+    "park description": "description",
+    "camping information": "camping",
+    "fees & passes": "fees",
+    "seasonal operations": "seasons",
+    "key attractions": "attractions",
+}
+
+
+def section_facet(heading: str) -> str:
+    return SECTION_FACETS.get(heading.lower(), "other")
+
+
+def split_sections(markdown: str) -> tuple[str, list[tuple[str, str]]]:
+    """Split a park document into its ``#`` title and ``(heading, body)`` sections.
+
+    The lines between the title and the first ``##`` heading become an
+    "Overview" section. Sections without any text are left out.
+    """
+    title = ""
+    sections = []
+    heading, lines = "Overview", []
+    for line in markdown.splitlines():
+        if line.startswith("# ") and not title:
+            title = line[2:].strip()
+        elif line.startswith("## "):
+            if any(line.strip() for line in lines):
+                sections.append((heading, "\n".join(lines).strip()))
+            heading, lines = line[3:].strip(), []
+        else:
+            lines.append(line)
+    if any(line.strip() for line in lines):
+        sections.append((heading, "\n".join(lines).strip()))
+    return title, sections
+
+
+def split_blocks(body: str) -> list[tuple[str, str]]:
+    """Group the lines of a section body into consecutive ``("text" | "table", block)`` pairs."""
+    blocks = []
+    for line in body.splitlines():
+        kind = "table" if line.lstrip().startswith("|") else "text"
+        if blocks and blocks[-1][0] == kind:
+            blocks[-1][1].append(line)
+        else:
+            blocks.append((kind, [line]))
+    return [(kind, "\n".join(lines).strip()) for kind, lines in blocks if "\n".join(lines).strip()]
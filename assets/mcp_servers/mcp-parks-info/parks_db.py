@@ -0,0 +1,151 @@
+"""Read-only access to the structured national parks database.
+
+The database is opened read-only and copied into memory once, where lookup
+indexes on ``park_ID`` and an FTS5 full-text index over the prose columns are
+created. All queries are parameterized constants, so sqlite3's statement cache
+keeps them prepared across calls.
+"""
+import os
+import re
+import sqlite3
+import threading
+
+DEFAULT_PARKS_DB_PATH = os.environ.get(
+    "PARKS_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Parks_DB", "national_parks.db"),
+)
+
+_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_details_park ON details (park_ID)",
+    "CREATE INDEX IF NOT EXISTS idx_camping_park ON camping (park_ID)",
+    "CREATE INDEX IF NOT EXISTS idx_fees_park ON fees (park_ID)",
+    "CREATE INDEX IF NOT EXISTS idx_seasons_park ON seasons (park_ID)",
+    "CREATE INDEX IF NOT EXISTS idx_attractions_park ON attractions (park_ID)",
+]
+
+# Full-text index over the park and attraction prose, stemmed so "dune" matches "dunes"
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE park_text USING fts5("
+    "park_ID UNINDEXED, park UNINDEXED, source UNINDEXED, title, body, tokenize = 'porter unicode61')"
+)
+_FTS_POPULATE = [
+    "INSERT INTO park_text (park_ID, park, source, title, body) "
+    "SELECT d.park_ID, p.name, 'description', p.name, "
+    "coalesce(d.unique_feature, '') || ' ' || coalesce(d.description, '') "
+    "FROM details d JOIN parks p ON p.park_ID = d.park_ID",
+    "INSERT INTO park_text (park_ID, park, source, title, body) "
+    "SELECT a.park_ID, p.name, 'attraction', a.attraction_name, "
+    "coalesce(a.description, '') || ' ' || coalesce(a.notes, '') "
+    "FROM attractions a JOIN parks p ON p.park_ID = a.park_ID",
+]
+_FTS_SEARCH = (
+    "SELECT park, source, title, snippet(park_text, 4, '[', ']', '...', 12) AS snippet, "
+    "-bm25(park_text, 2.0, 1.0) AS score "
+    "FROM park_text WHERE park_text MATCH ? ORDER BY score DESC LIMIT ?"
+)
+_FTS_TOKEN_RE = re.compile(r"\w+")
+_FTS_STOP_WORDS = {
+    "a", "an", "and", "are", "at", "can", "does", "for", "has", "have", "i", "in", "is", "it", "of", "on",
+    "or", "park", "parks", "see", "the", "to", "what", "where", "which", "with",
+}
+
+_FIND_PARK_EXACT = "SELECT park_ID, name FROM parks WHERE name = ? COLLATE NOCASE"
+_FIND_PARK_PARTIAL = (
+    "SELECT park_ID, name FROM parks "
+    "WHERE instr(lower(name), lower(?)) > 0 OR instr(lower(?), lower(name)) > 0"
+)
+
+# One prepared query per facet, keyed by the facet name used by the park tools
+FACET_QUERIES = {
+    "fees": "SELECT category, cost, notes FROM fees WHERE park_ID = ? ORDER BY fee_ID",
+    "camping": "SELECT type, capacity, amenities, notes FROM camping WHERE park_ID = ? ORDER BY camping_ID",
+    "seasons": "SELECT season_name, dates, characteristics FROM seasons WHERE park_ID = ? ORDER BY season_ID",
+    "attractions": (
+        "SELECT attraction_name, description, notes FROM attractions WHERE park_ID = ? ORDER BY attraction_ID"
+    ),
+    "description": "SELECT description FROM details WHERE park_ID = ? AND description IS NOT NULL",
+    "details": (
+        "SELECT location, established, size_acres, ecosystems, unique_feature FROM details WHERE park_ID = ?"
+    ),
+}
+
+
+class ParksDB:
+    """Indexed, read-only lookups of park facts."""
+
+    def __init__(self, path: str = DEFAULT_PARKS_DB_PATH):
+        source = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+        try:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+            source.backup(self._conn)
+        finally:
+            source.close()
+        for statement in _INDEXES:
+            self._conn.execute(statement)
+        try:
+            self._conn.execute(_FTS_SCHEMA)
+            for statement in _FTS_POPULATE:
+                self._conn.execute(statement)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5
+            self.has_fts = False
+        self._conn.commit()
+        self._conn.execute("PRAGMA query_only = ON")
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def park_names(self) -> list[str]:
+        with self._lock:
+            return [row["name"] for row in self._conn.execute("SELECT name FROM parks ORDER BY park_ID")]
+
+    def find_park(self, park_name: str) -> tuple[int, str] | None:
+        """Return ``(park_ID, name)`` for ``park_name``, or None if it is unknown or ambiguous."""
+        park_name = park_name.strip()
+        if not park_name:
+            return None
+        with self._lock:
+            row = self._conn.execute(_FIND_PARK_EXACT, (park_name,)).fetchone()
+            if row is None:
+                rows = self._conn.execute(_FIND_PARK_PARTIAL, (park_name, park_name)).fetchall()
+                row = rows[0] if len(rows) == 1 else None
+        return (row["park_ID"], row["name"]) if row is not None else None
+
+    def get_facet(self, park_name: str, facet: str) -> dict | None:
+        """Return ``{"park": name, "rows": [...]}`` for a facet, or None if the park or facet is missing."""
+        query = FACET_QUERIES.get(facet)
+        park = self.find_park(park_name)
+        if query is None or park is None:
+            return None
+        park_id, name = park
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(query, (park_id,))]
+        if not rows:
+            return None
+        return {"park": name, "rows": rows}
+
+    def search_text(self, query: str, limit: int = 5) -> list[dict]:
+        """Rank park descriptions and attractions against the keywords of ``query``.
+
+        Keywords are OR-ed, so documents matching more of them rank higher under
+        BM25, and matches in the attraction or park name count double.
+        """
+        if not self.has_fts:
+            return []
+        terms = [term for term in _FTS_TOKEN_RE.findall(query.lower()) if term not in _FTS_STOP_WORDS]
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(_FTS_SEARCH, (match, limit))]
+
+
+def format_facet(facts: dict) -> str:
+    """Render facet rows as a compact text answer."""
+    lines = []
+    for row in facts["rows"]:
+        lines.append(", ".join(f"{key}: {value}" for key, value in row.items() if value not in (None, "")))
+    return f"{facts['park']}\n" + "\n".join(f"- {line}" for line in lines)
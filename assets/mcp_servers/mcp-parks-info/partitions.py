@@ -0,0 +1,27 @@
+"""Naming of the per-document vector DBs that make up an incrementally ingested collection.
+
+Chunks can't be deleted from a vector DB one by one, so every document is
+stored in its own vector DB, "<collection>--<document stem>-<hash>". The stem
+keeps the ids readable. The hash of the full document id keeps them unique
+when two documents only differ in characters the stem drops, or in their
+extension. Used by the server and, loaded by path, by src/parks_ingest.py;
+assets/ui/modules/ingest.py mirrors it because the UI image can't import it.
+"""
+import hashlib
+import re
+
+PARTITION_SEPARATOR = "--"
+
+_PARTITION_RE = re.compile(r"^(?P<collection>.+)--[A-Za-z0-9_.]*-[0-9a-f]{8}$")
+
+
+def partition_id(collection: str, document_id: str) -> str:
+    stem = re.sub(r"[^A-Za-z0-9_.]+", "_", document_id.rsplit(".", 1)[0])
+    digest = hashlib.sha256(document_id.encode("utf-8")).hexdigest()[:8]
+    return f"{collection}{PARTITION_SEPARATOR}{stem}-{digest}"
+
+
+def collection_name(vector_db_id: str) -> str:
+    """Return the collection a vector DB belongs to; other vector DBs are their own collection."""
+    match = _PARTITION_RE.match(vector_db_id)
+    return match.group("collection") if match else vector_db_id
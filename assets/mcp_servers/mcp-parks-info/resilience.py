@@ -0,0 +1,122 @@
+"""Load shedding and circuit breaking for calls to the Llama Stack server."""
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+
+class DownstreamUnavailable(Exception):
+    """A downstream call was refused without being attempted."""
+
+
+class OverloadedError(DownstreamUnavailable):
+    pass
+
+
+class CircuitOpenError(DownstreamUnavailable):
+    pass
+
+
+class ConcurrencyLimiter:
+    """Bound outstanding downstream calls, and the callers queued behind them.
+
+    Callers beyond ``max_queue`` waiters are rejected immediately with
+    ``OverloadedError`` instead of queueing without limit.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @asynccontextmanager
+    async def acquire(self):
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            raise OverloadedError(
+                f"Server overloaded: {self.in_flight} downstream calls in flight and {self.waiting} queued"
+            )
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+
+class CircuitBreaker:
+    """Fail fast while the downstream error rate is too high.
+
+    The breaker tracks the outcome of the last ``window`` calls. Once at least
+    ``min_calls`` are recorded and the failure rate reaches ``failure_threshold``,
+    it opens and rejects every call for ``reset_timeout`` seconds. It then lets
+    a single probe call through (half-open): success closes the breaker, failure
+    opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: float = 0.5, window: int = 20, min_calls: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.opened = 0
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def failure_rate(self) -> float:
+        return self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0
+
+    def before_call(self) -> None:
+        """Raise ``CircuitOpenError`` if the call must not reach the downstream server."""
+        if self.state == self.OPEN:
+            retry_in = self._opened_at + self.reset_timeout - time.monotonic()
+            if retry_in > 0:
+                raise CircuitOpenError(f"Llama Stack server unavailable, retry in {retry_in:.0f}s")
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                raise CircuitOpenError("Llama Stack server unavailable, probing for recovery")
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self.state = self.CLOSED
+            self._outcomes.clear()
+        self._probe_in_flight = False
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self._outcomes.append(False)
+        if self.state == self.HALF_OPEN or (
+            len(self._outcomes) >= self.min_calls and self.failure_rate() >= self.failure_threshold
+        ):
+            self.state = self.OPEN
+            self.opened += 1
+            self._opened_at = time.monotonic()
+
+    def record_cancelled(self) -> None:
+        """Forget a call that ended without an outcome, so a half-open breaker can probe again."""
+        self._probe_in_flight = False
+
+    @asynccontextmanager
+    async def guard(self):
+        self.before_call()
+        try:
+            yield
+        except asyncio.CancelledError:
+            self.record_cancelled()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
@@ -0,0 +1,120 @@
+"""In-process BM25 retrieval over the Parks markdown corpus.
+
+The corpus is a handful of small markdown files, so it is split into one
+chunk per ``##`` section at startup (see ``park_sections``) and indexed in
+memory. Every chunk is tagged with its park and facet. The tools know both
+after resolving the park name, so they look the section up directly; BM25
+search ranks sections when either is unknown.
+"""
+import glob
+import math
+import os
+import re
+from collections import Counter
+
+from park_names import DEFAULT_PARKS_DOCS_PATH
+from park_sections import section_facet, split_sections
+
+_TOKEN_RE = re.compile(r"[a-z0-9$]+")
+_FIELD_RE = re.compile(r"\*\*([^*]+?):?\*\*:?\s*(.+)")
+_STOP_WORDS = {
+    "a", "an", "and", "are", "at", "for", "in", "is", "of", "on", "or", "the", "to", "what", "which", "with",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOP_WORDS]
+
+
+def _field_name(label: str) -> str:
+    return "_".join(_TOKEN_RE.findall(label.lower().replace("$", "")))
+
+
+def extract_rows(text: str) -> list[dict]:
+    """Parse the facts of a section into rows, without any generation.
+
+    Markdown table lines become one ``{column: cell}`` row each. Outside tables,
+    ``**Label:** value`` lines (as in a park's overview) are collected into a
+    single row.
+    """
+    rows = []
+    header = None
+    fields = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line.startswith("|"):
+            header = None
+            match = _FIELD_RE.match(line)
+            if match:
+                fields[_field_name(match.group(1))] = match.group(2).strip()
+            continue
+        cells = [cell.strip() for cell in line.strip("|").split("|")]
+        if header is None:
+            header = [_field_name(cell) for cell in cells]
+        elif not all(set(cell) <= set("-: ") for cell in cells):
+            rows.append(dict(zip(header, cells)))
+    if fields:
+        rows.insert(0, fields)
+    return rows
+
+
+def load_chunks(docs_path: str = DEFAULT_PARKS_DOCS_PATH) -> list[dict]:
+    """Return one ``{"park", "section", "facet", "document_id", "text"}`` chunk per document section."""
+    chunks = []
+    for path in sorted(glob.glob(os.path.join(docs_path, "*.md"))):
+        with open(path, encoding="utf-8") as f:
+            title, sections = split_sections(f.read())
+        for heading, body in sections:
+            chunks.append({
+                "park": title,
+                "section": heading,
+                "facet": section_facet(heading),
+                "document_id": os.path.basename(path),
+                "text": f"# {title}\n## {heading}\n{body}",
+            })
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 index over corpus chunks."""
+
+    def __init__(self, chunks: list[dict], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [Counter(tokenize(chunk["text"])) for chunk in chunks]
+        self._lengths = [sum(freqs.values()) for freqs in self._term_freqs]
+        self._avg_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        doc_freqs = Counter(term for freqs in self._term_freqs for term in freqs)
+        n = len(chunks)
+        self._idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()}
+        self._sections = {}
+        for chunk in chunks:
+            self._sections.setdefault((chunk["park"], chunk["facet"]), chunk)
+
+    @classmethod
+    def from_corpus(cls, docs_path: str = DEFAULT_PARKS_DOCS_PATH) -> "BM25Index":
+        return cls(load_chunks(docs_path))
+
+    def section(self, park: str, facet: str) -> dict | None:
+        """Return the chunk holding ``facet`` for ``park``, or None if the corpus has no such section."""
+        return self._sections.get((park, facet))
+
+    def search(self, query: str, top_k: int = 2, park: str | None = None, facet: str | None = None) -> list[tuple[float, dict]]:
+        """Return up to ``top_k`` ``(score, chunk)`` pairs, optionally limited to one park and facet."""
+        terms = [term for term in tokenize(query) if term in self._idf]
+        scored = []
+        for chunk, freqs, length in zip(self.chunks, self._term_freqs, self._lengths):
+            if park is not None and chunk["park"] != park:
+                continue
+            if facet is not None and chunk["facet"] != facet:
+                continue
+            score = 0.0
+            for term in terms:
+                tf = freqs.get(term)
+                if tf:
+                    norm = self.k1 * (1 - self.b + self.b * length / self._avg_length)
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scored.append((score, chunk))
+        scored.sort(key=lambda item: -item[0])
+        return scored[:top_k]
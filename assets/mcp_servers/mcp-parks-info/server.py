@@ -1,59 +1,896 @@
+import asyncio
+import contextlib
+import contextvars
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+
+import httpx
 from starlette.applications import Starlette
-from starlette.routing import Mount
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Mount, Route
 from mcp.server.fastmcp import FastMCP
 
+from geo import ParkLocationIndex
+from metrics import Registry
+from park_names import DEFAULT_PARKS_DOCS_PATH, ParkNameIndex
+from parks_db import DEFAULT_PARKS_DB_PATH, ParksDB, format_facet
+from partitions import PARTITION_SEPARATOR
+from resilience import CircuitBreaker, CircuitOpenError, ConcurrencyLimiter, OverloadedError
+from retriever import BM25Index, extract_rows
+
+logger = logging.getLogger(__name__)
+
+metrics = Registry()
+PARK_TOOL_CALLS = metrics.counter(
+    "park_tool_calls_total", "Park tool calls by tool and answer source", ("tool", "source")
+)
+PARK_TOOL_LATENCY = metrics.histogram(
+    "park_tool_latency_seconds", "End-to-end park tool latency", ("tool",)
+)
+PARK_TOOL_PHASE_LATENCY = metrics.histogram(
+    "park_tool_phase_seconds", "RAG turn latency by phase (client_setup, retrieval, generation)", ("tool", "phase")
+)
+PARK_TOOL_IN_FLIGHT = metrics.gauge("park_tool_in_flight", "Park tool calls in progress", ("tool",))
+PARK_RAG_IN_FLIGHT = metrics.gauge("park_rag_in_flight", "RAG turns in progress against Llama Stack", ("tool",))
+PARK_CACHE_HITS = metrics.counter("park_tool_cache_hits_total", "Park tool cache hits")
+PARK_CACHE_MISSES = metrics.counter("park_tool_cache_misses_total", "Park tool cache misses")
+PARK_CACHE_HIT_RATIO = metrics.gauge("park_tool_cache_hit_ratio", "Park tool cache hit ratio since startup")
+PARK_CACHE_SIZE = metrics.gauge("park_tool_cache_entries", "Entries in the park tool cache")
+PARK_LIVE_SESSIONS = metrics.gauge(
+    "park_agent_sessions_live", "Agent sessions this process has open on the Llama Stack server"
+)
+PARK_SESSION_DELETE_FAILURES = metrics.counter(
+    "park_agent_session_delete_failures_total", "Agent sessions that could not be deleted after their turn"
+)
+PARK_DOWNSTREAM_IN_FLIGHT = metrics.gauge("park_downstream_in_flight", "Calls in progress against Llama Stack")
+PARK_DOWNSTREAM_QUEUED = metrics.gauge("park_downstream_queued", "Calls waiting for a downstream slot")
+PARK_BREAKER_STATE = metrics.gauge(
+    "park_downstream_breaker_state", "Downstream circuit breaker state (0 closed, 1 half-open, 2 open)"
+)
+PARK_BREAKER_OPENED = metrics.counter("park_downstream_breaker_opened_total", "Times the downstream circuit breaker opened")
+PARK_COALESCED_CALLS = metrics.counter(
+    "park_tool_coalesced_calls_total", "Park tool calls that joined an identical in-flight RAG turn"
+)
+
+# MCP transport: "sse" keeps per-client sessions in one process; "streamable-http"
+# runs stateless so any worker or replica can serve any request
+MCP_TRANSPORT = os.environ.get("MCP_TRANSPORT", "sse")
+if MCP_TRANSPORT not in ("sse", "streamable-http"):
+    raise ValueError(f"Unsupported MCP_TRANSPORT: {MCP_TRANSPORT}")
+
+# Which park tools are listed to clients:
+# - "full": every tool, including the seven single-facet park tools
+# - "compact": the single-facet tools are hidden in favour of get_park_info, which keeps
+#   agent prompts that serialize every tool schema short. Hidden tools remain callable.
+PARK_TOOLS_MODE = os.environ.get("PARK_TOOLS_MODE", "full")
+if PARK_TOOLS_MODE not in ("full", "compact"):
+    raise ValueError(f"Unsupported PARK_TOOLS_MODE: {PARK_TOOLS_MODE}")
+
+
+class ParksMCP(FastMCP):
+    """FastMCP server that can leave some registered tools out of ``tools/list``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hidden_tools = set()
+
+    async def list_tools(self):
+        return [tool for tool in await super().list_tools() if tool.name not in self.hidden_tools]
+
+
 # Create an MCP server
-mcp = FastMCP("mcp-parks-info")
+mcp = ParksMCP("mcp-parks-info", stateless_http=MCP_TRANSPORT == "streamable-http")
 
 @mcp.resource("status://health")
 def get_health() -> str:
     """Get the server health status of the MCP Parks Info Server.
 
+    Reports whether the server is warmed up and ready, the state of the
+    Llama Stack connection and its recent latency.
+
     Examples:
     - "health check"
     - "is the server healthy?"
     """
-    return "Status: Healthy"
+    return json.dumps(readiness_report())
 
 # Default parameters for RAG tools
 DEFAULT_SERVER_URL = "http://localhost:8321"
 DEFAULT_SELECTED_MODEL = "meta-llama/Llama-3.2-3B-Instruct"
 DEFAULT_VECTOR_DB_ID = "Our_Parks_DB"
 
-def _execute_park_rag(park_name: str, agent_prompt: str, input_query: str) -> dict:
-    """Internal helper to execute a RAG call for a park tool."""
+# The Parks vector DB is ingested with one chunk per section or table (see
+# src/parks_ingest.py), so a single chunk holds the whole answer
+DEFAULT_RAG_QUERY_CONFIG = {
+    "query_generator_config": {"type": "default", "separator": " "},
+    "max_tokens_in_context": 512,
+    "max_chunks": 1
+}
+
+# Where RAG tools retrieve context:
+# - "remote": the Llama Stack agent runs builtin::rag against DEFAULT_VECTOR_DB_ID
+# - "local": an in-process BM25 index over the Parks markdown retrieves the context
+#   and only the generation goes to Llama Stack
+# - "local_only": the retrieved chunks are returned as-is, with no network call
+PARK_RAG_MODE = os.environ.get("PARK_RAG_MODE", "remote")
+if PARK_RAG_MODE not in ("remote", "local", "local_only"):
+    raise ValueError(f"Unsupported PARK_RAG_MODE: {PARK_RAG_MODE}")
+# Sections retrieved by BM25 when a call can't be answered from one park's facet section
+PARK_LOCAL_TOP_K = int(os.environ.get("PARK_LOCAL_TOP_K", "2"))
+LOCAL_RAG_INSTRUCTIONS = "Answer the question about the park using only the provided context."
+
+# How tabular facets (fees, camping, seasons, attractions, overview facts) are answered:
+# - "generate": database rows are rendered as text; corpus facts go through an LLM turn
+# - "extractive": rows are returned as structured JSON from the database or parsed
+#   from the park's document section, with no LLM generation. Free-text facets like
+#   the description are always generated.
+PARK_ANSWER_MODE = os.environ.get("PARK_ANSWER_MODE", "generate")
+if PARK_ANSWER_MODE not in ("generate", "extractive"):
+    raise ValueError(f"Unsupported PARK_ANSWER_MODE: {PARK_ANSWER_MODE}")
+
+# Maximum number of in-flight RAG turns per park tool
+PARK_TOOL_MAX_CONCURRENCY = int(os.environ.get("PARK_TOOL_MAX_CONCURRENCY", "8"))
+
+# Response cache for park tools; entries expire after the TTL (seconds)
+PARK_CACHE_MAXSIZE = int(os.environ.get("PARK_CACHE_MAXSIZE", "1024"))
+PARK_CACHE_TTL = float(os.environ.get("PARK_CACHE_TTL", "3600"))
+
+# Optional file shared by all workers; touching it invalidates every worker's cache
+PARK_CACHE_EPOCH_PATH = os.environ.get("PARK_CACHE_EPOCH_PATH")
+PARK_CACHE_EPOCH_CHECK_INTERVAL = 1.0
+
+# Deadlines in seconds: for a whole park tool call, including queueing, and for a
+# single downstream RAG turn, which counts as a failure when it runs out
+PARK_TOOL_TIMEOUT = float(os.environ.get("PARK_TOOL_TIMEOUT", "60"))
+PARK_DOWNSTREAM_TIMEOUT = float(os.environ.get("PARK_DOWNSTREAM_TIMEOUT", "30"))
+
+# Outstanding calls against Llama Stack across all tools, and callers allowed to queue
+# for a slot; callers beyond the queue are rejected at once
+PARK_DOWNSTREAM_MAX_CONCURRENCY = int(os.environ.get("PARK_DOWNSTREAM_MAX_CONCURRENCY", "32"))
+PARK_DOWNSTREAM_MAX_QUEUE = int(os.environ.get("PARK_DOWNSTREAM_MAX_QUEUE", "64"))
+
+# The circuit breaker opens when at least this share of the last calls in the window
+# failed, and lets a probe call through after the reset timeout (seconds)
+PARK_BREAKER_FAILURE_THRESHOLD = float(os.environ.get("PARK_BREAKER_FAILURE_THRESHOLD", "0.5"))
+PARK_BREAKER_WINDOW = int(os.environ.get("PARK_BREAKER_WINDOW", "20"))
+PARK_BREAKER_MIN_CALLS = 5
+PARK_BREAKER_RESET_TIMEOUT = float(os.environ.get("PARK_BREAKER_RESET_TIMEOUT", "30"))
+
+# Warm the server up at startup, before reporting ready: import the client library,
+# open the connection pool, resolve the vector DB, register the agents and run one
+# canned retrieval so the embedding model is loaded
+PARK_WARMUP = os.environ.get("PARK_WARMUP", "true").lower() in ("1", "true", "yes")
+PARK_WARMUP_QUERY = "What is the cost of entering the park?"
+
+# Refuse to start when the Parks corpus or database is missing, instead of quietly
+# answering without name resolution, database facts, search and nearest-park lookups;
+# the container image sets this
+PARK_REQUIRE_DATA = os.environ.get("PARK_REQUIRE_DATA", "false").lower() in ("1", "true", "yes")
+
+# Progress notifications sent while a RAG turn runs: at most one partial answer per
+# interval, and retrieved context or partial answers truncated to the given length
+PARK_PROGRESS_INTERVAL = float(os.environ.get("PARK_PROGRESS_INTERVAL", "0.25"))
+PARK_PROGRESS_MAX_CHARS = 2000
+
+# Keep-alive pool shared by every tool call against the Llama Stack server
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 32
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+# Agent instructions for each park tool; one agent is registered per prompt
+PARK_AGENT_PROMPTS = {
+    "get_park_location": "Use the RAG tool (builtin::rag) to answer the question about the park's location.",
+    "get_park_cost": "Use the RAG tool (builtin::rag) to answer the question about the park's cost.",
+    "get_park_description": "Use the RAG tool (builtin::rag) to answer the question about the park's description.",
+    "get_park_camping_sites": "Use the RAG tool (builtin::rag) to answer the question about the park's camping sites.",
+    "get_park_seasonal_operations": "Use the RAG tool (builtin::rag) to answer the question about the park's seasonal operations.",
+    "get_park_seasonal_attractions": "Use the RAG tool (builtin::rag) to answer the question about the park's seasonal attractions.",
+    "get_park_other_information": "Use the RAG tool (builtin::rag) to answer additional questions about the park.",
+}
+
+# Park tools answered from the structured parks database when it has the facet
+PARK_TOOL_FACETS = {
+    "get_park_cost": "fees",
+    "get_park_description": "description",
+    "get_park_camping_sites": "camping",
+    "get_park_seasonal_operations": "seasons",
+    "get_park_seasonal_attractions": "attractions",
+    "get_park_other_information": "details",
+}
+
+# Document section each park tool retrieves from the local index
+PARK_TOOL_SECTION_FACETS = {**PARK_TOOL_FACETS, "get_park_location": "details"}
+
+# Facets made of table rows or labelled fields, answered without an LLM in extractive mode
+EXTRACTIVE_FACETS = {"fees", "camping", "seasons", "attractions", "details"}
+
+# Corpus table headers and overview labels that the parks database names differently
+EXTRACTED_FIELD_NAMES = {
+    "seasons": {"season": "season_name"},
+    "attractions": {"attraction": "attraction_name"},
+    "details": {"size": "size_acres"},
+}
+_INTEGER_RE = re.compile(r"\d[\d,]*")
+
+
+def normalize_park_name(park_name: str) -> str:
+    """Normalize a park name for use in cache keys."""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", park_name.lower()).split())
+
+
+class ParkToolCache:
+    """Size-bounded LRU cache of park tool results with a TTL.
+
+    Each worker process keeps its own entries. When ``epoch_path`` is set, the
+    modification time of that file acts as a shared cache epoch: invalidating
+    the cache in one worker touches the file, and every other worker drops its
+    entries once it notices the change.
+    """
+
+    def __init__(self, maxsize: int = PARK_CACHE_MAXSIZE, ttl: float = PARK_CACHE_TTL, epoch_path: str | None = PARK_CACHE_EPOCH_PATH):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.epoch_path = epoch_path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._epoch = self._read_epoch()
+        self._epoch_checked_at = time.monotonic()
+
+    def _read_epoch(self) -> int | None:
+        if self.epoch_path is None:
+            return None
+        try:
+            return os.stat(self.epoch_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _sync_epoch(self) -> None:
+        """Drop every entry if another worker moved the shared cache epoch."""
+        if self.epoch_path is None:
+            return
+        now = time.monotonic()
+        if now - self._epoch_checked_at < PARK_CACHE_EPOCH_CHECK_INTERVAL:
+            return
+        self._epoch_checked_at = now
+        epoch = self._read_epoch()
+        if epoch != self._epoch:
+            self._epoch = epoch
+            self._entries.clear()
+
+    def _bump_epoch(self) -> None:
+        with open(self.epoch_path, "a"):
+            pass
+        os.utime(self.epoch_path, None)
+        self._epoch = self._read_epoch()
+
+    @staticmethod
+    def key(tool_name: str, park_name: str) -> tuple[str, str]:
+        return tool_name, normalize_park_name(park_name)
+
+    def get(self, key: tuple[str, str]):
+        self._sync_epoch()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: tuple[str, str], value) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, park_name: str | None = None) -> int:
+        """Drop every entry, or only the entries for ``park_name``; returns the number dropped.
+
+        With a shared epoch file, other workers always drop all of their entries.
+        """
+        if self.epoch_path is not None:
+            self._bump_epoch()
+        if park_name is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+        park_key = normalize_park_name(park_name)
+        stale = [key for key in self._entries if key[1] == park_key]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    @property
+    def epoch(self) -> int | None:
+        """The shared cache epoch last seen by this worker."""
+        return self._epoch
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+park_tool_cache = ParkToolCache()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one in-flight task.
+
+    Every waiter receives the shared task's result or exception. A cancelled
+    waiter only stops waiting; the shared task is cancelled when its last
+    waiter goes away.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key, fn):
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = {"task": asyncio.ensure_future(fn()), "waiters": 0}
+            call["task"].add_done_callback(lambda _task: self._forget(key, call))
+        else:
+            self.coalesced += 1
+        call["waiters"] += 1
+        try:
+            return await asyncio.shield(call["task"])
+        except asyncio.CancelledError:
+            if call["waiters"] == 1 and not call["task"].done():
+                # Forget the call now, so a caller arriving before the task
+                # finishes cancelling starts a fresh one instead of joining it
+                self._forget(key, call)
+                call["task"].cancel()
+            raise
+        finally:
+            call["waiters"] -= 1
+
+    def _forget(self, key, call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+park_tool_calls = SingleFlight()
+
+
+downstream_limiter = ConcurrencyLimiter(PARK_DOWNSTREAM_MAX_CONCURRENCY, PARK_DOWNSTREAM_MAX_QUEUE)
+downstream_breaker = CircuitBreaker(
+    failure_threshold=PARK_BREAKER_FAILURE_THRESHOLD,
+    window=PARK_BREAKER_WINDOW,
+    min_calls=PARK_BREAKER_MIN_CALLS,
+    reset_timeout=PARK_BREAKER_RESET_TIMEOUT,
+)
+_BREAKER_STATE_VALUES = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+
+
+# Latency of successful downstream calls: the last one and an exponential moving average
+downstream_latency = {"last_s": None, "ewma_s": None}
+
+
+def _observe_downstream_latency(elapsed: float) -> None:
+    downstream_latency["last_s"] = elapsed
+    ewma = downstream_latency["ewma_s"]
+    downstream_latency["ewma_s"] = elapsed if ewma is None else 0.8 * ewma + 0.2 * elapsed
+
+
+@contextlib.asynccontextmanager
+async def _downstream_call():
+    """Run a call against Llama Stack under the shared limiter, circuit breaker and deadline."""
+    async with downstream_limiter.acquire():
+        async with downstream_breaker.guard():
+            start = time.perf_counter()
+            async with asyncio.timeout(PARK_DOWNSTREAM_TIMEOUT):
+                yield
+            _observe_downstream_latency(time.perf_counter() - start)
+
+
+def _collect_cache_metrics() -> None:
+    stats = park_tool_cache.stats()
+    PARK_CACHE_HITS.set_total(stats["hits"])
+    PARK_CACHE_MISSES.set_total(stats["misses"])
+    PARK_CACHE_HIT_RATIO.set(stats["hit_rate"])
+    PARK_CACHE_SIZE.set(stats["size"])
+    PARK_COALESCED_CALLS.set_total(park_tool_calls.coalesced)
+    PARK_DOWNSTREAM_IN_FLIGHT.set(downstream_limiter.in_flight)
+    PARK_DOWNSTREAM_QUEUED.set(downstream_limiter.waiting)
+    PARK_BREAKER_STATE.set(_BREAKER_STATE_VALUES[downstream_breaker.state])
+    PARK_BREAKER_OPENED.set_total(downstream_breaker.opened)
+
+
+metrics.add_collector(_collect_cache_metrics)
+
+
+def invalidate_park_cache(park_name: str | None = None) -> int:
+    """Invalidate cached park tool results, e.g. after the Parks documents are re-ingested.
+
+    The park agents are dropped as well and registered again on their next turn.
+    """
+    if park_name is not None:
+        park_name = _get_park_index().resolve(park_name) or park_name
+    _agents.clear()
+    return park_tool_cache.invalidate(park_name)
+
+
+_client = None
+_parks_db = None
+_park_index = None
+_local_index = None
+_location_index = None
+_agents = {}
+_agents_epoch = None
+_agent_lock = asyncio.Lock()
+_tool_semaphores = {}
+
+
+def _get_client():
+    """Return the process-wide async Llama Stack client, creating it on first use."""
+    global _client
+    if _client is None:
+        from llama_stack_client import AsyncLlamaStackClient, DefaultAsyncHttpxClient
+
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=DEFAULT_MAX_CONNECTIONS,
+                max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+            )
+        )
+        _client = AsyncLlamaStackClient(
+            base_url=DEFAULT_SERVER_URL, http_client=http_client, timeout=PARK_DOWNSTREAM_TIMEOUT
+        )
+    return _client
+
+
+def _get_tool_semaphore(agent_prompt: str) -> asyncio.Semaphore:
+    """Return the semaphore bounding concurrent turns for the tool using ``agent_prompt``."""
+    semaphore = _tool_semaphores.get(agent_prompt)
+    if semaphore is None:
+        semaphore = _tool_semaphores[agent_prompt] = asyncio.Semaphore(PARK_TOOL_MAX_CONCURRENCY)
+    return semaphore
+
+
+async def _park_vector_db_ids() -> list[str]:
+    """Return the vector DBs holding the Parks corpus: its per-document partitions, if ingested incrementally."""
+    prefix = DEFAULT_VECTOR_DB_ID + PARTITION_SEPARATOR
+    partitions = sorted(db.identifier for db in await _get_client().vector_dbs.list() if db.identifier.startswith(prefix))
+    return partitions or [DEFAULT_VECTOR_DB_ID]
+
+
+async def _get_agent(agent_prompt: str):
+    """Return the agent registered for ``agent_prompt``, registering it once if needed.
+
+    Agents are registered again after the cache is invalidated, so they pick up
+    document partitions added or removed by a re-ingestion.
+    """
+    global _agents_epoch
+    if _agents_epoch != park_tool_cache.epoch:
+        _agents.clear()
+        _agents_epoch = park_tool_cache.epoch
+    agent = _agents.get(agent_prompt)
+    if agent is None:
+        async with _agent_lock:
+            agent = _agents.get(agent_prompt)
+            if agent is None:
+                from llama_stack_client.lib.agents.agent import AsyncAgent
+
+                vector_db_ids = await _park_vector_db_ids()
+                agent = AsyncAgent(
+                    _get_client(),
+                    model=DEFAULT_SELECTED_MODEL,
+                    instructions=agent_prompt,
+                    tools=[{"name": "builtin::rag", "args": {"vector_db_ids": vector_db_ids, "query_config": DEFAULT_RAG_QUERY_CONFIG}}]
+                )
+                await agent.initialize()
+                _agents[agent_prompt] = agent
+    return agent
+
+
+@contextlib.asynccontextmanager
+async def _park_session(rag_agent, input_query: str):
+    """Open an agent session for a single turn and delete it afterwards.
+
+    Sessions keep every turn's messages, so reusing one would grow the prompt
+    of each later turn; deleting it instead keeps the Llama Stack server's
+    session storage bounded by the number of turns in flight.
+    """
+    session_id = await rag_agent.create_session(hashlib.md5(input_query.encode()).hexdigest())
+    PARK_LIVE_SESSIONS.inc()
     try:
-        from llama_stack_client import LlamaStackClient, Agent
-    except ImportError:
-        return "Error: The 'llama_stack_client' library is not installed. Please install it."
-
-    client = LlamaStackClient(base_url=DEFAULT_SERVER_URL)
-    query_config = {
-        "query_generator_config": {"type": "default", "separator": " "},
-        "max_tokens_in_context": 300,
-        "max_chunks": 2
-    }
+        yield session_id
+    finally:
+        with contextlib.suppress(ValueError):
+            rag_agent.sessions.remove(session_id)
+        try:
+            await asyncio.shield(
+                _get_client().agents.session.delete(session_id=session_id, agent_id=rag_agent.agent_id)
+            )
+        except Exception as e:
+            PARK_SESSION_DELETE_FAILURES.inc()
+            logger.warning("Could not delete agent session %s: %s", session_id, e)
+        finally:
+            PARK_LIVE_SESSIONS.dec()
 
-    rag_agent = Agent(
-        client,
-        model=DEFAULT_SELECTED_MODEL,
-        instructions=agent_prompt,
-        tools=[{"name": "builtin::rag", "args": {"vector_db_ids": [DEFAULT_VECTOR_DB_ID], "query_config": query_config}}]
-    )
 
-    import hashlib, json as _json
-    session_id = rag_agent.create_session(hashlib.md5(input_query.encode()).hexdigest())
-    response = rag_agent.create_turn(
+async def register_park_agents() -> None:
+    """Open the client pool and register one agent per park tool prompt."""
+    for agent_prompt in PARK_AGENT_PROMPTS.values():
+        await _get_agent(agent_prompt)
+
+
+async def close_client() -> None:
+    """Release the pooled connections and forget the registered agents."""
+    global _client
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _agents.clear()
+
+
+def _get_parks_db() -> ParksDB | None:
+    """Return the process-wide parks database, or None if it cannot be opened."""
+    global _parks_db
+    if _parks_db is None:
+        try:
+            _parks_db = ParksDB()
+        except sqlite3.Error as e:
+            logger.warning("Parks database unavailable, using RAG only: %s", e)
+            _parks_db = False
+    return _parks_db or None
+
+
+def _get_park_index() -> ParkNameIndex:
+    """Return the park name index built from the parks database and markdown corpus."""
+    global _park_index
+    if _park_index is None:
+        parks_db = _get_parks_db()
+        _park_index = ParkNameIndex.build(parks_db.park_names() if parks_db else ())
+    return _park_index
+
+
+def _get_local_index() -> BM25Index:
+    """Return the in-process retrieval index over the Parks markdown corpus."""
+    global _local_index
+    if _local_index is None:
+        _local_index = BM25Index.from_corpus()
+    return _local_index
+
+
+def _get_location_index() -> ParkLocationIndex:
+    """Return the nearest-park index over the coordinates in the Parks markdown corpus."""
+    global _location_index
+    if _location_index is None:
+        _location_index = ParkLocationIndex.from_corpus()
+    return _location_index
+
+
+def _lookup_park_facts(tool_name: str, park_name: str) -> dict | None:
+    """Answer a park tool from the parks database, or return None if the park or facet is missing."""
+    facet = PARK_TOOL_FACETS.get(tool_name)
+    parks_db = _get_parks_db()
+    if facet is None or parks_db is None:
+        return None
+    facts = parks_db.get_facet(park_name, facet)
+    if facts is None:
+        return None
+    return {"result": format_facet(facts)}
+
+
+def _database_row(facet: str, row: dict) -> dict:
+    """Rename and convert a row parsed from the corpus to the parks database's schema.
+
+    Overview years and acreages become integers, and the coordinates a
+    ``[lat, lon]`` list of floats, as the database would return them.
+    """
+    names = EXTRACTED_FIELD_NAMES.get(facet, {})
+    row = {names.get(field, field): value for field, value in row.items()}
+    if facet == "details":
+        for field in ("established", "size_acres"):
+            match = _INTEGER_RE.search(row.get(field) or "")
+            if match:
+                row[field] = int(match.group().replace(",", ""))
+        if "coordinates" in row:
+            try:
+                row["coordinates"] = [float(value) for value in json.loads(row["coordinates"])]
+            except (TypeError, ValueError):
+                pass
+    return row
+
+
+def _extract_park_facts(tool_name: str, park_name: str) -> tuple[dict | None, str]:
+    """Return structured ``{"park", "rows"}`` facts for a tabular tool and their source.
+
+    The parks database is tried first, then the park's section of the markdown
+    corpus is parsed into rows with the database's field names and types.
+    Returns ``(None, "")`` for free-text tools or when neither has the facet.
+    """
+    if PARK_TOOL_SECTION_FACETS.get(tool_name) not in EXTRACTIVE_FACETS:
+        return None, ""
+    parks_db = _get_parks_db()
+    facet = PARK_TOOL_FACETS.get(tool_name)
+    if facet is not None and parks_db is not None:
+        facts = parks_db.get_facet(park_name, facet)
+        if facts is not None:
+            return facts, "database"
+    section = PARK_TOOL_SECTION_FACETS[tool_name]
+    chunk = _get_local_index().section(park_name, section)
+    rows = [_database_row(section, row) for row in extract_rows(chunk["text"])] if chunk is not None else []
+    if not rows:
+        return None, ""
+    return {"park": park_name, "rows": rows}, "extracted"
+
+
+async def _run_park_tool(tool_name: str, park_name: str, input_query: str) -> dict:
+    """Answer a park tool from the cache or parks database, falling back to a RAG turn.
+
+    ``park_name`` is first resolved to its canonical corpus name; unknown parks are
+    rejected with the closest candidates. ``input_query`` is formatted with the
+    resolved ``park_name``.
+    """
+    start = time.perf_counter()
+    source = "error"
+    with PARK_TOOL_IN_FLIGHT.track_inprogress(tool=tool_name):
+        try:
+            result, source = await _answer_park_tool(tool_name, park_name, input_query)
+        finally:
+            PARK_TOOL_CALLS.inc(tool=tool_name, source=source)
+            PARK_TOOL_LATENCY.observe(time.perf_counter() - start, tool=tool_name)
+    return result
+
+
+async def _answer_park_tool(tool_name: str, park_name: str, input_query: str) -> tuple[dict, str]:
+    """Return a park tool result and the source that answered it."""
+    park_index = _get_park_index()
+    if park_index.names:
+        resolved = park_index.resolve(park_name)
+        if resolved is None:
+            return {
+                "error": f"Unknown park: {park_name}",
+                "candidates": [name for name, _score in park_index.candidates(park_name)],
+            }, "unknown_park"
+        park_name = resolved
+    input_query = input_query.format(park_name=park_name)
+    cache_key = park_tool_cache.key(tool_name, park_name)
+    result = park_tool_cache.get(cache_key)
+    if result is not None:
+        return result, "cache"
+    result = None
+    if PARK_ANSWER_MODE == "extractive":
+        result, source = _extract_park_facts(tool_name, park_name)
+    if result is None:
+        # Free-text facets such as the description still come from the database when it has them
+        result, source = _lookup_park_facts(tool_name, park_name), "database"
+    if result is None:
+        try:
+            result, source = await asyncio.wait_for(
+                park_tool_calls.do(cache_key, lambda: _execute_rag(tool_name, park_name, input_query)),
+                PARK_TOOL_TIMEOUT,
+            ), "rag" if PARK_RAG_MODE == "remote" else "local_rag"
+        except TimeoutError:
+            return {"error": f"{tool_name} timed out for {park_name}, try again later"}, "timeout"
+        except OverloadedError as e:
+            return {"error": str(e)}, "overloaded"
+        except CircuitOpenError as e:
+            return {"error": str(e)}, "circuit_open"
+    if not isinstance(result, dict):
+        return result, "error"
+    park_tool_cache.put(cache_key, result)
+    return result, source
+
+
+async def _execute_rag(tool_name: str, park_name: str, input_query: str) -> dict:
+    """Run the RAG path selected by PARK_RAG_MODE, guarding calls that reach Llama Stack."""
+    agent_prompt = PARK_AGENT_PROMPTS[tool_name]
+    if PARK_RAG_MODE == "local_only":
+        return await _execute_local_rag(park_name, agent_prompt, input_query, tool_name=tool_name)
+    execute_rag = _execute_park_rag if PARK_RAG_MODE == "remote" else _execute_local_rag
+    # Queue on the tool's own bound first, so waiting for it holds no shared slot and
+    # counts toward neither the deadline nor the circuit breaker
+    async with _get_tool_semaphore(agent_prompt):
+        async with _downstream_call():
+            return await execute_rag(park_name, agent_prompt, input_query, tool_name=tool_name)
+
+
+def _observe_turn_phases(tool_name: str, turn) -> None:
+    """Record retrieval and generation time from the steps of a completed turn."""
+    phases = {"retrieval": 0.0, "generation": 0.0}
+    for step in turn.steps or []:
+        if step.started_at is None or step.completed_at is None:
+            continue
+        elapsed = (step.completed_at - step.started_at).total_seconds()
+        if step.step_type in ("tool_execution", "memory_retrieval"):
+            phases["retrieval"] += elapsed
+        elif step.step_type == "inference":
+            phases["generation"] += elapsed
+    for phase, elapsed in phases.items():
+        PARK_TOOL_PHASE_LATENCY.observe(elapsed, tool=tool_name, phase=phase)
+
+
+class ParkProgress:
+    """Forward the stages of a RAG turn to the MCP client as progress notifications.
+
+    Progress runs from 0 to ``TOTAL``: the retrieved context is sent as soon as
+    retrieval completes (1), partial answers while generating (2), then done (3).
+    Nothing is sent unless the client asked for progress with a progress token.
+    """
+
+    TOTAL = 3
+
+    def __init__(self, ctx=None):
+        self._ctx = None
+        self._last_sent = float("-inf")
+        if ctx is not None:
+            try:
+                meta = ctx.request_context.meta
+            except ValueError:
+                meta = None
+            if meta is not None and meta.progressToken is not None:
+                self._ctx = ctx
+
+    @property
+    def enabled(self) -> bool:
+        return self._ctx is not None
+
+    async def report(self, progress: float, message: str, total: float | None = None, throttle: bool = False) -> None:
+        if self._ctx is None:
+            return
+        if throttle:
+            now = time.monotonic()
+            if now - self._last_sent < PARK_PROGRESS_INTERVAL:
+                return
+            self._last_sent = now
+        try:
+            await self._ctx.report_progress(progress, total or self.TOTAL, message[:PARK_PROGRESS_MAX_CHARS])
+        except Exception as e:
+            logger.debug("Could not send progress notification: %s", e)
+
+
+# Set by tools that report their own progress, e.g. get_parks_info, to silence nested turns
+_park_progress = contextvars.ContextVar("park_progress", default=None)
+
+
+def _get_progress() -> ParkProgress:
+    """Return the progress reporter of the current tool call.
+
+    Identical calls coalesced by single-flight share one turn, which reports to
+    the caller that started it.
+    """
+    progress = _park_progress.get()
+    if progress is None:
+        progress = ParkProgress(mcp.get_context())
+    return progress
+
+
+async def _execute_local_rag(park_name: str, agent_prompt: str, input_query: str, tool_name: str = "unknown") -> dict:
+    """Answer a park tool from the in-process index, generating with Llama Stack unless in local_only mode."""
+    with PARK_TOOL_PHASE_LATENCY.time(tool=tool_name, phase="retrieval"):
+        local_index = _get_local_index()
+        facet = PARK_TOOL_SECTION_FACETS.get(tool_name)
+        # The tool names the park and facet, so their section holds the whole answer
+        chunk = local_index.section(park_name, facet) if facet is not None else None
+        if chunk is not None:
+            chunks = [chunk]
+        else:
+            park = park_name if park_name in _get_park_index().names else None
+            chunks = [chunk for _score, chunk in local_index.search(input_query, top_k=PARK_LOCAL_TOP_K, park=park)]
+    context = "\n\n".join(chunk["text"] for chunk in chunks)
+    if PARK_RAG_MODE == "local_only":
+        return {"result": context}
+    progress = _get_progress()
+    await progress.report(1, f"Retrieved context:\n{context}")
+
+    with PARK_RAG_IN_FLIGHT.track_inprogress(tool=tool_name):
+        with PARK_TOOL_PHASE_LATENCY.time(tool=tool_name, phase="generation"):
+            try:
+                client = _get_client()
+            except ImportError:
+                return "Error: The 'llama_stack_client' library is not installed. Please install it."
+            messages = [
+                {"role": "system", "content": LOCAL_RAG_INSTRUCTIONS},
+                {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {input_query}"},
+            ]
+            if not progress.enabled:
+                response = await client.inference.chat_completion(model_id=DEFAULT_SELECTED_MODEL, messages=messages)
+                return {"result": response.completion_message.content}
+            answer = ""
+            stream = await client.inference.chat_completion(model_id=DEFAULT_SELECTED_MODEL, messages=messages, stream=True)
+            async for chunk in stream:
+                if chunk.event.delta.type == "text":
+                    answer += chunk.event.delta.text
+                    await progress.report(2, answer, throttle=True)
+    await progress.report(3, "Done")
+    return {"result": answer}
+
+
+def _content_text(content) -> str:
+    """Flatten tool response content (a string, a content item or a list of them) to text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(_content_text(item) for item in content)
+    return getattr(content, "text", "")
+
+
+async def _stream_turn(rag_agent, session_id: str, input_query: str):
+    """Run an agent turn, reporting retrieved context and partial answers as they stream in.
+
+    Returns the completed turn.
+    """
+    progress = _get_progress()
+    answer = ""
+    turn = None
+    stream = await rag_agent.create_turn(
         messages=[{"role": "user", "content": input_query}],
         session_id=session_id,
-        stream=False
+        stream=True,
     )
+    async for chunk in stream:
+        # The agent yields a chunk carrying the server's error instead of an event when the turn fails
+        error = getattr(chunk, "error", None)
+        if error is not None:
+            message = error.get("message", error) if isinstance(error, dict) else error
+            raise RuntimeError(f"Agent turn failed: {message}")
+        payload = chunk.event.payload
+        if payload.event_type == "step_complete" and payload.step_type in ("tool_execution", "memory_retrieval"):
+            details = payload.step_details
+            if payload.step_type == "tool_execution":
+                context = "\n".join(_content_text(response.content) for response in details.tool_responses)
+            else:
+                context = _content_text(details.inserted_context)
+            await progress.report(1, f"Retrieved context:\n{context}")
+        elif payload.event_type == "step_progress" and payload.step_type == "inference":
+            if payload.delta.type == "text":
+                answer += payload.delta.text
+                await progress.report(2, answer, throttle=True)
+        elif payload.event_type == "turn_complete":
+            turn = payload.turn
+    if turn is None:
+        raise RuntimeError("Agent turn ended without completing")
+    await progress.report(3, "Done")
+    return turn
+
+
+async def _execute_park_rag(park_name: str, agent_prompt: str, input_query: str, tool_name: str = "unknown") -> dict:
+    """Internal helper to execute a RAG call for a park tool."""
+    with PARK_RAG_IN_FLIGHT.track_inprogress(tool=tool_name):
+        with PARK_TOOL_PHASE_LATENCY.time(tool=tool_name, phase="client_setup"):
+            try:
+                rag_agent = await _get_agent(agent_prompt)
+            except ImportError:
+                return "Error: The 'llama_stack_client' library is not installed. Please install it."
+
+        async with _park_session(rag_agent, input_query) as session_id:
+            response = await _stream_turn(rag_agent, session_id, input_query)
+        _observe_turn_phases(tool_name, response)
     # json_str = response["output_message"]["content"].model_dump_json()
     # return _json.loads(json_str)
     return {"result": response.output_message.content}
 
 @mcp.tool()
-def get_park_location(park_name: str) -> dict:
+async def get_park_location(park_name: str) -> dict:
     """Get the location of a specified park.
 
     :param park_name: The name of the park (e.g., "Crimson Basin").
@@ -64,14 +901,14 @@ def get_park_location(park_name: str) -> dict:
     Example:
         >>> get_park_location("Crimson Basin")
     """
-    return _execute_park_rag(
+    return await _run_park_tool(
+        "get_park_location",
         park_name,
-        agent_prompt="Use the RAG tool (builtin::rag) to answer the question about the park's location.",
-        input_query=f"What is the location and coordinates of {park_name}?"
+        input_query="What is the location and coordinates of {park_name}?"
     )
 
 @mcp.tool()
-def get_park_cost(park_name: str) -> dict:
+async def get_park_cost(park_name: str) -> dict:
     """Get the cost to enter a specified park.
 
     :param park_name: The name of the park (e.g., "Azure Mangrove Wilderness Park").
@@ -82,14 +919,14 @@ def get_park_cost(park_name: str) -> dict:
     Example:
         >>> get_park_cost("Azure Mangrove Wilderness Park")
     """
-    return _execute_park_rag(
+    return await _run_park_tool(
+        "get_park_cost",
         park_name,
-        agent_prompt="Use the RAG tool (builtin::rag) to answer the question about the park's cost.",
-        input_query=f"What is the cost of entering {park_name}?"
+        input_query="What is the cost of entering {park_name}?"
     )
 
 @mcp.tool()
-def get_park_description(park_name: str) -> dict:
+async def get_park_description(park_name: str) -> dict:
     """Get a description of a specified park.
 
     :param park_name: The name of the park (e.g., "Prismatic Painted Prairie").
@@ -100,86 +937,370 @@ def get_park_description(park_name: str) -> dict:
     Example:
         >>> get_park_description("Prismatic Painted Prairie")
     """
-    return _execute_park_rag(
+    return await _run_park_tool(
+        "get_park_description",
         park_name,
-        agent_prompt="Use the RAG tool (builtin::rag) to answer the question about the park's description.",
-        input_query=f"Provide a description of {park_name}."
+        input_query="Provide a description of {park_name}."
     )
 
 @mcp.tool()
-def get_park_camping_sites(park_name: str) -> dict:
+async def get_park_camping_sites(park_name: str) -> dict:
     """Get the camping sites available at a specified park.
 
-    :param park_name: The name of the park (e.g., "Grand Canyon National Park").
+    :param park_name: The name of the park (e.g., "Granite Spire Alpine Sanctuary").
     :type park_name: str
     :return: A dictionary with camping site details.
     :rtype: dict
 
     Example:
-        >>> get_park_camping_sites("Grand Canyon National Park")
+        >>> get_park_camping_sites("Granite Spire Alpine Sanctuary")
     """
-    return _execute_park_rag(
+    return await _run_park_tool(
+        "get_park_camping_sites",
         park_name,
-        agent_prompt="Use the RAG tool (builtin::rag) to answer the question about the park's camping sites.",
-        input_query=f"What are the camping sites available in {park_name}?"
+        input_query="What are the camping sites available in {park_name}?"
     )
 
 @mcp.tool()
-def get_park_seasonal_operations(park_name: str) -> dict:
+async def get_park_seasonal_operations(park_name: str) -> dict:
     """Get the seasonal operations of a specified park.
 
-    :param park_name: The name of the park (e.g., "Glacier National Park").
+    :param park_name: The name of the park (e.g., "Obsidian Rainforest Reserve").
     :type park_name: str
     :return: A dictionary with seasonal operation info.
     :rtype: dict
 
     Example:
-        >>> get_park_seasonal_operations("Glacier National Park")
+        >>> get_park_seasonal_operations("Obsidian Rainforest Reserve")
     """
-    return _execute_park_rag(
+    return await _run_park_tool(
+        "get_park_seasonal_operations",
         park_name,
-        agent_prompt="Use the RAG tool (builtin::rag) to answer the question about the park's seasonal operations.",
-        input_query=f"What are the seasonal operations for {park_name}?"
+        input_query="What are the seasonal operations for {park_name}?"
     )
 
 @mcp.tool()
-def get_park_seasonal_attractions(park_name: str) -> dict:
+async def get_park_seasonal_attractions(park_name: str) -> dict:
     """Get the seasonal attractions of a specified park.
 
-    :param park_name: The name of the park (e.g., "Zion National Park").
+    :param park_name: The name of the park (e.g., "Crimson Basin Desert Preserve").
     :type park_name: str
     :return: A dictionary with seasonal attractions.
     :rtype: dict
 
     Example:
-        >>> get_park_seasonal_attractions("Zion National Park")
+        >>> get_park_seasonal_attractions("Crimson Basin Desert Preserve")
     """
-    return _execute_park_rag(
+    return await _run_park_tool(
+        "get_park_seasonal_attractions",
         park_name,
-        agent_prompt="Use the RAG tool (builtin::rag) to answer the question about the park's seasonal attractions.",
-        input_query=f"What are the seasonal attractions for {park_name}?"
+        input_query="What are the seasonal attractions for {park_name}?"
     )
 
 @mcp.tool()
-def get_park_other_information(park_name: str) -> dict:
+async def get_park_other_information(park_name: str) -> dict:
     """Get additional information about a specified park.
 
-    :param park_name: The name of the park (e.g., "Denali National Park").
+    :param park_name: The name of the park (e.g., "Prismatic Painted Prairie").
     :type park_name: str
     :return: A dictionary with additional park facts.
     :rtype: dict
 
     Example:
-        >>> get_park_other_information("Denali National Park")
+        >>> get_park_other_information("Prismatic Painted Prairie")
     """
-    return _execute_park_rag(
+    return await _run_park_tool(
+        "get_park_other_information",
         park_name,
-        agent_prompt="Use the RAG tool (builtin::rag) to answer additional questions about the park.",
-        input_query=f"Provide other information for {park_name}."
+        input_query="Provide other information for {park_name}."
     )
 
+# Facets accepted by get_parks_info and the park tool answering each one
+PARK_FACET_TOOLS = {
+    "location": get_park_location,
+    "cost": get_park_cost,
+    "description": get_park_description,
+    "camping_sites": get_park_camping_sites,
+    "seasonal_operations": get_park_seasonal_operations,
+    "seasonal_attractions": get_park_seasonal_attractions,
+    "other_information": get_park_other_information,
+}
+
+if PARK_TOOLS_MODE == "compact":
+    mcp.hidden_tools.update(PARK_AGENT_PROMPTS)
+
+# Upper bound on parks x facets answered by one get_parks_info call
+MAX_BATCH_LOOKUPS = int(os.environ.get("PARK_MAX_BATCH_LOOKUPS", "50"))
+
+
+@mcp.tool()
+async def get_parks_info(park_names: list[str], facets: list[str]) -> dict:
+    """Get several facts about several parks in one call, e.g. to compare parks.
+
+    :param park_names: The names of the parks (e.g., ["Crimson Basin", "Granite Spire"]).
+    :type park_names: list[str]
+    :param facets: The facts to look up for every park. Any of "location", "cost",
+        "description", "camping_sites", "seasonal_operations", "seasonal_attractions",
+        "other_information".
+    :type facets: list[str]
+    :return: A dictionary mapping each park name to a dictionary of facet results.
+    :rtype: dict
+
+    Example:
+        >>> get_parks_info(["Crimson Basin", "Granite Spire"], ["cost", "camping_sites"])
+    """
+    unknown_facets = [facet for facet in facets if facet not in PARK_FACET_TOOLS]
+    if unknown_facets:
+        return {"error": f"Unknown facets: {', '.join(unknown_facets)}", "facets": list(PARK_FACET_TOOLS)}
+    park_names = list(dict.fromkeys(park_names))
+    facets = list(dict.fromkeys(facets))
+    lookups = [(park_name, facet) for park_name in park_names for facet in facets]
+    if len(lookups) > MAX_BATCH_LOOKUPS:
+        return {"error": f"Too many lookups: {len(lookups)} requested, at most {MAX_BATCH_LOOKUPS} allowed"}
+
+    # Report one step per answered lookup instead of the progress of every nested turn
+    progress = ParkProgress(mcp.get_context())
+    token = _park_progress.set(ParkProgress())
+    done = 0
+
+    async def lookup(park_name: str, facet: str):
+        nonlocal done
+        try:
+            return await PARK_FACET_TOOLS[facet](park_name)
+        finally:
+            done += 1
+            await progress.report(done, f"Answered {facet} for {park_name}", total=len(lookups))
+
+    try:
+        answers = await asyncio.gather(
+            *(lookup(park_name, facet) for park_name, facet in lookups),
+            return_exceptions=True,
+        )
+    finally:
+        _park_progress.reset(token)
+    results = {park_name: {} for park_name in park_names}
+    for (park_name, facet), answer in zip(lookups, answers):
+        if isinstance(answer, Exception):
+            answer = {"error": f"{type(answer).__name__}: {answer}"}
+        results[park_name][facet] = answer
+    return {"results": results}
+
+@mcp.tool()
+async def get_park_info(park_name: str, facets: list[str]) -> dict:
+    """Get facts about one park.
+
+    facets: any of location, cost, description, camping_sites, seasonal_operations, seasonal_attractions, other_information.
+    """
+    answer = await get_parks_info([park_name], facets)
+    return answer["results"][park_name] if "results" in answer else answer
+
+# Upper bound on the matches returned by one search_parks call
+MAX_SEARCH_RESULTS = 20
+
+
+@mcp.tool()
+async def search_parks(query: str, limit: int = 5) -> dict:
+    """Find which parks match keywords, searching park descriptions and attractions.
+
+    Use this for keyword questions when the park is not known yet, e.g. "which park
+    has singing dunes". Matches are ranked by relevance, best first.
+
+    :param query: Keywords to search for (e.g., "singing dunes").
+    :type query: str
+    :param limit: Maximum number of matches to return (default 5).
+    :type limit: int
+    :return: A dictionary with the ranked matches, each with its park, source
+        ("description" or "attraction"), title, a snippet with the keywords in
+        [brackets] and a relevance score.
+    :rtype: dict
+
+    Example:
+        >>> search_parks("singing dunes")
+    """
+    start = time.perf_counter()
+    parks_db = _get_parks_db()
+    if parks_db is None or not parks_db.has_fts:
+        PARK_TOOL_CALLS.inc(tool="search_parks", source="error")
+        return {"error": "Full-text search is unavailable: the parks database could not be indexed"}
+    matches = parks_db.search_text(query, limit=max(1, min(limit, MAX_SEARCH_RESULTS)))
+    PARK_TOOL_CALLS.inc(tool="search_parks", source="database")
+    PARK_TOOL_LATENCY.observe(time.perf_counter() - start, tool="search_parks")
+    return {"query": query, "matches": matches}
+
+# Upper bound on the parks returned by one find_nearest_parks call
+MAX_NEAREST_PARKS = 20
+
+
+@mcp.tool()
+async def find_nearest_parks(lat: float, lon: float, k: int = 3) -> dict:
+    """Find the parks closest to a location, nearest first.
+
+    Use this for "which park is closest to X" questions, after resolving X to
+    coordinates (e.g. with a maps geocoding tool).
+
+    :param lat: Latitude of the location in decimal degrees (e.g., 36.1699).
+    :type lat: float
+    :param lon: Longitude of the location in decimal degrees (e.g., -115.1398).
+    :type lon: float
+    :param k: Number of parks to return (default 3).
+    :type k: int
+    :return: A dictionary with the nearest parks, each with its coordinates and
+        great-circle distance in kilometers.
+    :rtype: dict
+
+    Example:
+        >>> find_nearest_parks(36.1699, -115.1398, k=1)
+    """
+    start = time.perf_counter()
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        PARK_TOOL_CALLS.inc(tool="find_nearest_parks", source="error")
+        return {"error": f"Invalid coordinates: [{lat}, {lon}]; latitude must be in [-90, 90] and longitude in [-180, 180]"}
+    location_index = _get_location_index()
+    if not location_index.names:
+        PARK_TOOL_CALLS.inc(tool="find_nearest_parks", source="error")
+        return {"error": f"Nearest-park lookups are unavailable: no park coordinates found in {DEFAULT_PARKS_DOCS_PATH}"}
+    parks = location_index.nearest(lat, lon, k=max(1, min(k, MAX_NEAREST_PARKS)))
+    PARK_TOOL_CALLS.inc(tool="find_nearest_parks", source="corpus")
+    PARK_TOOL_LATENCY.observe(time.perf_counter() - start, tool="find_nearest_parks")
+    return {"lat": lat, "lon": lon, "parks": parks}
+
+# Warm-up progress: "pending", "running", "ready", "degraded" (a downstream step failed;
+# those steps are retried lazily on first use) or "skipped"
+warmup_state = {"state": "pending", "steps": {}, "error": None}
+
+
+async def _warmup_step(name: str, fn) -> None:
+    start = time.perf_counter()
+    async with asyncio.timeout(PARK_DOWNSTREAM_TIMEOUT):
+        await fn()
+    warmup_state["steps"][name] = round(time.perf_counter() - start, 4)
+
+
+async def warm_up() -> None:
+    """Pay the cold-start costs of the first tool call before reporting ready."""
+    warmup_state["state"] = "running"
+    try:
+        async def import_client():
+            import llama_stack_client.lib.agents.agent  # noqa: F401
+
+        await _warmup_step("import", import_client)
+        if PARK_RAG_MODE == "local_only":
+            await _warmup_step("retrieval", lambda: asyncio.to_thread(_get_local_index().search, PARK_WARMUP_QUERY))
+        else:
+            async def open_pool():
+                await _get_client().inspect.health()
+
+            await _warmup_step("connect", open_pool)
+            vector_db_ids = []
+
+            async def resolve_vector_db():
+                vector_db_ids.extend(await _park_vector_db_ids())
+
+            if PARK_RAG_MODE == "remote":
+                await _warmup_step("vector_db", resolve_vector_db)
+                await _warmup_step("agents", register_park_agents)
+                await _warmup_step(
+                    "retrieval",
+                    lambda: _get_client().vector_io.query(vector_db_id=vector_db_ids[0], query=PARK_WARMUP_QUERY),
+                )
+        warmup_state["state"] = "ready"
+    except Exception as e:
+        logger.warning("Warm-up failed, continuing with lazy setup: %s", e)
+        warmup_state["state"] = "degraded"
+        warmup_state["error"] = f"{type(e).__name__}: {e}"
+
+
+def readiness_report() -> dict:
+    """Return the warm-up state, Llama Stack connection state and recent downstream latency."""
+    # An open breaker is reported but doesn't gate readiness: cache and database answers keep working
+    return {
+        "ready": warmup_state["state"] in ("ready", "degraded", "skipped"),
+        "warmup": warmup_state,
+        "downstream": {
+            "breaker": downstream_breaker.state,
+            "failure_rate": round(downstream_breaker.failure_rate(), 3),
+            "in_flight": downstream_limiter.in_flight,
+            "queued": downstream_limiter.waiting,
+            "latency_s": downstream_latency,
+        },
+    }
+
+
+def missing_park_data() -> list[str]:
+    """Describe each Parks data source the server could not load."""
+    missing = []
+    if _get_parks_db() is None:
+        missing.append(f"parks database {DEFAULT_PARKS_DB_PATH}")
+    if not glob.glob(os.path.join(DEFAULT_PARKS_DOCS_PATH, "*.md")):
+        missing.append(f"Parks markdown corpus {DEFAULT_PARKS_DOCS_PATH}")
+    return missing
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    missing = missing_park_data()
+    if missing:
+        message = (
+            f"Missing {' and '.join(missing)}: database answers, park name resolution, local retrieval, "
+            "search_parks and find_nearest_parks are unavailable"
+        )
+        if PARK_REQUIRE_DATA:
+            raise RuntimeError(message + " (mount the data or unset PARK_REQUIRE_DATA)")
+        logger.error(message)
+    _get_park_index()
+    _get_location_index()
+    if PARK_RAG_MODE != "remote" or PARK_ANSWER_MODE == "extractive":
+        _get_local_index()
+    # Warm up in the background so liveness probes pass while readiness waits for it;
+    # without warm-up the client pool and agents are set up on first use
+    warmup_task = None
+    if PARK_WARMUP:
+        warmup_task = asyncio.create_task(warm_up())
+    else:
+        warmup_state["state"] = "skipped"
+    try:
+        if MCP_TRANSPORT == "streamable-http":
+            async with mcp.session_manager.run():
+                yield
+        else:
+            yield
+    finally:
+        if warmup_task is not None:
+            warmup_task.cancel()
+        await close_client()
+        if _parks_db:
+            _parks_db.close()
+
+
+async def invalidate_cache(request: Request) -> JSONResponse:
+    """Invalidate the park tool cache; pass ``?park_name=...`` to drop a single park."""
+    dropped = invalidate_park_cache(request.query_params.get("park_name"))
+    return JSONResponse({"invalidated": dropped, **park_tool_cache.stats()})
+
+
+async def liveness(request: Request) -> JSONResponse:
+    """Liveness probe: the process is up and serving requests."""
+    return JSONResponse({"alive": True})
+
+
+async def readiness(request: Request) -> JSONResponse:
+    """Readiness probe: 200 once warmed up, 503 before."""
+    report = readiness_report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Expose server metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 app = Starlette(
     routes=[
-        Mount('/', app=mcp.sse_app()),
-    ]
+        Route('/healthz/live', liveness),
+        Route('/healthz/ready', readiness),
+        Route('/metrics', metrics_endpoint),
+        Route('/cache/invalidate', invalidate_cache, methods=['POST']),
+        Mount('/', app=mcp.streamable_http_app() if MCP_TRANSPORT == "streamable-http" else mcp.sse_app()),
+    ],
+    lifespan=lifespan,
 )
@@ -5,9 +5,38 @@
 # the root directory of this source tree.
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from llama_stack_client import LlamaStackClient
 
+# Rows sent per scoring request, and scoring requests kept in flight at once
+SCORING_BATCH_SIZE = int(os.environ.get("SCORING_BATCH_SIZE", "32"))
+SCORING_MAX_WORKERS = int(os.environ.get("SCORING_MAX_WORKERS", "4"))
+
+# Rows sent per evaluate_rows request, and evaluation requests kept in flight at once
+EVAL_BATCH_SIZE = int(os.environ.get("EVAL_BATCH_SIZE", "1"))
+EVAL_MAX_WORKERS = int(os.environ.get("EVAL_MAX_WORKERS", "8"))
+
+
+def _map_batches(fn, rows: list, batch_size: int, max_workers: int):
+    """Call ``fn(batch)`` for consecutive batches of rows on a thread pool.
+
+    Yields ``(start, batch, result)`` in completion order, on the calling thread.
+    Batches that have not started are cancelled if a call fails or the caller stops iterating.
+    """
+    batch_size = max(1, batch_size)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(fn, rows[start : start + batch_size]): start for start in range(0, len(rows), batch_size)
+        }
+        try:
+            for future in as_completed(futures):
+                start = futures[future]
+                yield start, rows[start : start + batch_size], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
 
 class LlamaStackApi:
     def __init__(self):
@@ -22,11 +51,59 @@ class LlamaStackApi:
             },
         )
 
-    def run_scoring(self, row, scoring_function_ids: list[str], scoring_params: dict | None):
-        """Run scoring on a single row"""
+    def iter_score_rows(
+        self,
+        rows: list[dict],
+        scoring_function_ids: list[str],
+        scoring_params: dict | None,
+        batch_size: int = SCORING_BATCH_SIZE,
+        max_workers: int = SCORING_MAX_WORKERS,
+    ):
+        """Score rows in concurrent batches.
+
+        Yields ``(index, row, scores)`` for every row as soon as its batch completes,
+        so results arrive in completion order rather than row order.
+        ``scores`` maps each scoring function to the row's score.
+        """
         if not scoring_params:
             scoring_params = {fn_id: None for fn_id in scoring_function_ids}
-        return self.client.scoring.score(input_rows=[row], scoring_functions=scoring_params)
+
+        def score(batch):
+            return self.client.scoring.score(input_rows=batch, scoring_functions=scoring_params)
+
+        for start, batch, response in _map_batches(score, rows, batch_size, max_workers):
+            for offset, row in enumerate(batch):
+                scores = {fn_id: response.results[fn_id].score_rows[offset] for fn_id in scoring_function_ids}
+                yield start + offset, row, scores
+
+    def iter_evaluate_rows(
+        self,
+        benchmark_id: str,
+        rows: list[dict],
+        scoring_functions: list[str],
+        benchmark_config: dict,
+        batch_size: int = EVAL_BATCH_SIZE,
+        max_workers: int = EVAL_MAX_WORKERS,
+    ):
+        """Generate and score rows in concurrent batches.
+
+        Yields ``(index, row, generation, scores)`` for every row as soon as its batch
+        completes, so results arrive in completion order rather than row order.
+        ``scores`` maps each scoring function to the row's score.
+        """
+
+        def evaluate(batch):
+            return self.client.eval.evaluate_rows(
+                benchmark_id=benchmark_id,
+                input_rows=batch,
+                scoring_functions=scoring_functions,
+                benchmark_config=benchmark_config,
+            )
+
+        for start, batch, eval_res in _map_batches(evaluate, rows, batch_size, max_workers):
+            for offset, row in enumerate(batch):
+                scores = {fn: eval_res.scores[fn].score_rows[offset] for fn in scoring_functions}
+                yield start + offset, row, eval_res.generations[offset], scores
 
 
 llama_stack_api = LlamaStackApi()
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# SQLite database holding the results of completed evaluation and scoring rows
+DEFAULT_EVAL_CACHE_PATH = os.environ.get(
+    "EVAL_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".llama_stack_ui", "eval_cache.sqlite3")
+)
+
+# SQLite limits the number of bound parameters in a single statement
+_MAX_KEYS_PER_QUERY = 500
+
+
+def result_key(*parts) -> str:
+    """Hash everything a row's result depends on into a cache key."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvalResultCache:
+    """Persistent, content-addressed store of per-row evaluation results.
+
+    Every row is committed as soon as it completes, so an interrupted run
+    resumes from the rows that were already evaluated. Results are grouped
+    by namespace (e.g. one per benchmark) so they can be purged selectively.
+    """
+
+    def __init__(self, path: str = DEFAULT_EVAL_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        # Shared by every Streamlit session, so statements are serialized
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_namespace ON results (namespace)")
+        self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict:
+        """Return the cached results of the given keys, leaving out the ones not cached."""
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), _MAX_KEYS_PER_QUERY):
+            chunk = unique_keys[start : start + _MAX_KEYS_PER_QUERY]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                fetched = self._conn.execute(
+                    f"SELECT key, value FROM results WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+            for key, value in fetched:
+                found[key] = json.loads(value)
+        return found
+
+    def put(self, key: str, namespace: str, value) -> None:
+        value = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, namespace, value, created_at) VALUES (?, ?, ?, ?)",
+                (key, namespace, value, time.time()),
+            )
+            self._conn.commit()
+
+    def count(self, namespace: str | None = None) -> int:
+        with self._lock:
+            if namespace is None:
+                return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM results WHERE namespace = ?", (namespace,)).fetchone()[0]
+
+    def purge(self, namespace: str | None = None) -> int:
+        """Delete the cached results of a namespace, or all of them; returns the number deleted."""
+        with self._lock:
+            if namespace is None:
+                cursor = self._conn.execute("DELETE FROM results")
+            else:
+                cursor = self._conn.execute("DELETE FROM results WHERE namespace = ?", (namespace,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_eval_result_cache = None
+_eval_result_cache_error = None
+_eval_result_cache_lock = threading.Lock()
+
+
+def get_eval_result_cache() -> EvalResultCache | None:
+    """Return the shared result cache, opening it on first use.
+
+    Returns None when the cache can't be opened, e.g. on a read-only home
+    directory, so the evaluation pages run without caching instead of failing.
+    """
+    global _eval_result_cache, _eval_result_cache_error
+    with _eval_result_cache_lock:
+        if _eval_result_cache is None and _eval_result_cache_error is None:
+            try:
+                _eval_result_cache = EvalResultCache()
+            except (OSError, sqlite3.Error) as e:
+                _eval_result_cache_error = e
+        return _eval_result_cache
+
+
+def eval_result_cache_error() -> Exception | None:
+    """Return why the result cache could not be opened, if it couldn't."""
+    return _eval_result_cache_error
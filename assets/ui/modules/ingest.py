@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import re
+
+from llama_stack_client import RAGDocument
+
+from modules.utils import data_url_from_file
+
+# Per-document vector DBs are named "<collection>--<file stem>-<hash of the file name>".
+# Mirrors assets/mcp_servers/mcp-parks-info/partitions.py, which the UI image can't import.
+PARTITION_SEPARATOR = "--"
+_PARTITION_RE = re.compile(r"^(?P<collection>.+)--[A-Za-z0-9_.]*-[0-9a-f]{8}$")
+
+# Where the content hashes ingested into each collection are recorded
+DEFAULT_MANIFEST_DIR = os.environ.get(
+    "RAG_INGEST_MANIFEST_DIR", os.path.join(os.path.expanduser("~"), ".llama_stack_ui", "manifests")
+)
+
+
+def partition_id(collection: str, file_name: str) -> str:
+    stem = re.sub(r"[^A-Za-z0-9_.]+", "_", file_name.rsplit(".", 1)[0])
+    digest = hashlib.sha256(file_name.encode("utf-8")).hexdigest()[:8]
+    return f"{collection}{PARTITION_SEPARATOR}{stem}-{digest}"
+
+
+def collection_name(vector_db_id: str) -> str:
+    """Return the collection a vector DB belongs to; unpartitioned vector DBs are their own collection."""
+    match = _PARTITION_RE.match(vector_db_id)
+    return match.group("collection") if match else vector_db_id
+
+
+def collection_vector_db_ids(vector_db_ids: list[str], collections: list[str]) -> list[str]:
+    """Expand collection names into the ids of the vector DBs holding their documents."""
+    selected = set(collections)
+    return [vector_db_id for vector_db_id in vector_db_ids if collection_name(vector_db_id) in selected]
+
+
+class CollectionIngestionManager:
+    """Incrementally ingest uploaded files into a document collection.
+
+    Every file is stored in its own vector DB, "<collection>--<file>-<hash>", because
+    chunks cannot be deleted from a vector DB one by one. A manifest of content
+    hashes lets re-uploads of unchanged files skip embedding, while a changed
+    file replaces its vector DB and with it every stale chunk. If the manifest
+    can't be written, e.g. on a read-only home directory, files are still
+    ingested and ``manifest_error`` says why they will be embedded again next time.
+    """
+
+    def __init__(self, client, collection: str, provider_id: str, manifest_dir: str = DEFAULT_MANIFEST_DIR,
+                 embedding_model: str = "all-MiniLM-L6-v2", embedding_dimension: int = 384):
+        self.client = client
+        self.collection = collection
+        self.provider_id = provider_id
+        self.manifest_path = os.path.join(manifest_dir, f"{collection}.json")
+        self.embedding_model = embedding_model
+        self.embedding_dimension = embedding_dimension
+        self.manifest_error = None
+
+    def partition_id(self, file_name: str) -> str:
+        return partition_id(self.collection, file_name)
+
+    def load_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_manifest(self, manifest: dict) -> None:
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def sync(self, uploaded_files, chunk_size_in_tokens: int = 512) -> dict:
+        """Ingest new and changed uploads; returns the "added", "updated" and "unchanged" file names."""
+        manifest = self.load_manifest()
+        registered = {vector_db.identifier for vector_db in self.client.vector_dbs.list()}
+        summary = {"added": [], "updated": [], "unchanged": []}
+        partition_files = {self.partition_id(file_name): file_name for file_name in manifest}
+        for uploaded_file in uploaded_files:
+            other = partition_files.setdefault(self.partition_id(uploaded_file.name), uploaded_file.name)
+            if other != uploaded_file.name:
+                raise ValueError(
+                    f"Files {other} and {uploaded_file.name} map to the same vector DB {self.partition_id(other)}"
+                )
+        for uploaded_file in uploaded_files:
+            digest = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+            partition_id = self.partition_id(uploaded_file.name)
+            if manifest.get(uploaded_file.name) == digest and partition_id in registered:
+                summary["unchanged"].append(uploaded_file.name)
+                continue
+            if partition_id in registered:
+                self.client.vector_dbs.unregister(vector_db_id=partition_id)
+            self.client.vector_dbs.register(
+                vector_db_id=partition_id,
+                embedding_dimension=self.embedding_dimension,
+                embedding_model=self.embedding_model,
+                provider_id=self.provider_id,
+            )
+            self.client.tool_runtime.rag_tool.insert(
+                vector_db_id=partition_id,
+                documents=[RAGDocument(document_id=uploaded_file.name, content=data_url_from_file(uploaded_file))],
+                chunk_size_in_tokens=chunk_size_in_tokens,
+            )
+            summary["updated" if uploaded_file.name in manifest else "added"].append(uploaded_file.name)
+            manifest[uploaded_file.name] = digest
+            if self.manifest_error is None:
+                try:
+                    self.save_manifest(manifest)
+                except OSError as e:
+                    self.manifest_error = e
+        return summary
@@ -0,0 +1,311 @@
+import json
+import numbers
+import os
+import tempfile
+import time
+import uuid
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import streamlit as st
+
+# Rows buffered in Python lists before they are converted to Arrow and written out
+RESULTS_CHUNK_ROWS = int(os.environ.get("RESULTS_CHUNK_ROWS", "1000"))
+
+# Where the Parquet files of evaluation results are written
+RESULTS_SPILL_DIR = os.environ.get("RESULTS_SPILL_DIR", os.path.join(tempfile.gettempdir(), "llama_stack_ui_results"))
+
+# Seconds a results file is kept before a later run deletes it
+RESULTS_SPILL_TTL = int(os.environ.get("RESULTS_SPILL_TTL", "86400"))
+
+# Rows shown while a run is in progress, and read back into the final results table
+RESULTS_LIVE_ROWS = 20
+RESULTS_PREVIEW_ROWS = 1000
+
+# Position of each result in the dataset, added by the evaluation pages
+ROW_COLUMN = "row"
+
+
+def _cell(value):
+    """Normalize a value for Arrow: None for missing, Python scalars, and JSON for anything nested."""
+    # numbers covers the NumPy scalars found in rows read with pandas
+    if value is None:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        # Missing CSV cells are read as NaN
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+def _value_type(value) -> pa.DataType:
+    if isinstance(value, bool):
+        return pa.bool_()
+    if isinstance(value, int):
+        return pa.int64()
+    if isinstance(value, float):
+        return pa.float64()
+    return pa.string()
+
+
+def _widen(left: pa.DataType, right: pa.DataType) -> pa.DataType:
+    """Return a type holding the values of both types: null adopts the other, numbers widen to float64, else string."""
+    if left == right or pa.types.is_null(right):
+        return left
+    if pa.types.is_null(left):
+        return right
+    numeric = (pa.int64(), pa.float64())
+    if left in numeric and right in numeric:
+        return pa.float64()
+    return pa.string()
+
+
+def _column(values: list) -> pa.Array:
+    type_ = pa.null()
+    for value in values:
+        if value is not None:
+            type_ = _widen(type_, _value_type(value))
+    if pa.types.is_string(type_):
+        values = [value if value is None or isinstance(value, str) else json.dumps(value) for value in values]
+    return pa.array(values, type=type_)
+
+
+def _conform(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Cast a chunk to the widened schema, adding the columns it lacks as nulls."""
+    columns = []
+    for field in schema:
+        if field.name not in table.column_names:
+            columns.append(pa.nulls(table.num_rows, field.type))
+            continue
+        column = table[field.name]
+        if pa.types.is_string(field.type) and pa.types.is_boolean(column.type):
+            # As JSON, like the booleans of a column that was a string column from the start
+            column = pc.if_else(column, "true", "false")
+        columns.append(pc.cast(column, field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _prune_spill_dir(spill_dir: str, ttl: float) -> None:
+    """Delete the results files older than ``ttl`` seconds."""
+    cutoff = time.time() - ttl
+    for entry in os.scandir(spill_dir):
+        if not (entry.name.startswith("results-") and entry.name.endswith(".parquet")):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            # Removed by another session, or still being written on a platform that locks it
+            continue
+
+
+class ResultTableBuilder:
+    """Accumulate evaluation results column by column, spilling them to Parquet.
+
+    Each scoring function's score dict is flattened into ``<scoring_fn>.<field>``
+    columns. Every ``chunk_rows`` rows the buffered columns are written to a
+    Parquet chunk file and folded into per-scoring-function aggregates, so memory
+    stays flat however long the run is. Column types come from the values seen:
+    None and NaN leave a type open, integers mixed with floats widen to float64,
+    and any other mix widens to string. Keys first seen in a later row add a
+    column that is null for the rows before. ``finish`` merges the chunks into one
+    file under the widened schema, sorted by ``row`` so it follows the dataset.
+    Files left by earlier runs are deleted once they are older than ``spill_ttl``
+    seconds.
+    """
+
+    def __init__(self, scoring_functions: list[str], spill_dir: str = RESULTS_SPILL_DIR,
+                 chunk_rows: int = RESULTS_CHUNK_ROWS, spill_ttl: float = RESULTS_SPILL_TTL):
+        self.scoring_functions = scoring_functions
+        self.chunk_rows = max(1, chunk_rows)
+        os.makedirs(spill_dir, exist_ok=True)
+        _prune_spill_dir(spill_dir, spill_ttl)
+        self._stem = os.path.join(spill_dir, f"results-{uuid.uuid4().hex}")
+        self.path = self._stem + ".parquet"
+        self.num_rows = 0
+        self.schema = None
+        # Every column seen so far, widened over all chunks
+        self._types = {}
+        self._columns = {}
+        self._buffered = 0
+        # Path and row range of every chunk written so far
+        self._chunks = []
+        self._last_chunk = None
+        self._stats = {fn: {"rows": 0, "scored": 0, "sum": 0.0, "min": None, "max": None} for fn in scoring_functions}
+        self._distributions = {fn: Counter() for fn in scoring_functions}
+
+    def _flatten(self, record: dict) -> dict:
+        flat = {}
+        for key, value in record.items():
+            if key in self.scoring_functions and isinstance(value, dict):
+                for field, field_value in value.items():
+                    flat[f"{key}.{field}"] = field_value
+            else:
+                flat[key] = value
+        return flat
+
+    def append(self, record: dict) -> None:
+        flat = self._flatten(record)
+        for name in flat:
+            if name not in self._columns:
+                self._columns[name] = [None] * self._buffered
+        for name, values in self._columns.items():
+            values.append(_cell(flat.get(name)))
+        self._buffered += 1
+        self.num_rows += 1
+        if self._buffered >= self.chunk_rows:
+            self._flush()
+
+    def _buffered_table(self, rows: slice = slice(None)) -> pa.Table:
+        return pa.table({name: _column(values[rows]) for name, values in self._columns.items()})
+
+    def _flush(self) -> None:
+        if not self._buffered:
+            return
+        table = self._buffered_table()
+        self._columns = {name: [] for name in self._columns}
+        self._buffered = 0
+        path = f"{self._stem}.part{len(self._chunks)}.parquet"
+        pq.write_table(table, path)
+        row_range = None
+        if ROW_COLUMN in table.column_names:
+            positions = table[ROW_COLUMN]
+            if pa.types.is_integer(positions.type) and not positions.null_count:
+                row_range = pc.min_max(positions).as_py()
+        self._chunks.append({"path": path, "row_range": row_range})
+        for field in table.schema:
+            self._types[field.name] = _widen(self._types.get(field.name, pa.null()), field.type)
+        self._last_chunk = table
+        self._aggregate(table)
+
+    def _aggregate(self, table: pa.Table) -> None:
+        for fn in self.scoring_functions:
+            stats = self._stats[fn]
+            stats["rows"] += table.num_rows
+            column_name = f"{fn}.score"
+            if column_name not in table.column_names:
+                continue
+            scores = table[column_name]
+            stats["scored"] += pc.count(scores).as_py()
+            if pa.types.is_string(scores.type):
+                for entry in pc.value_counts(scores).to_pylist():
+                    if entry["values"] is not None:
+                        self._distributions[fn][entry["values"]] += entry["counts"]
+                continue
+            scores = pc.cast(scores, pa.float64())
+            total = pc.sum(scores).as_py()
+            if total is None:
+                continue
+            stats["sum"] += total
+            min_max = pc.min_max(scores).as_py()
+            stats["min"] = min_max["min"] if stats["min"] is None else min(stats["min"], min_max["min"])
+            stats["max"] = min_max["max"] if stats["max"] is None else max(stats["max"], min_max["max"])
+
+    def tail(self, n: int) -> pd.DataFrame:
+        """Return the last ``n`` rows appended, for a live view whose cost doesn't grow with the run."""
+        frames = []
+        if self._buffered < n and self._last_chunk is not None:
+            frames.append(self._last_chunk.slice(max(0, self._last_chunk.num_rows - (n - self._buffered))).to_pandas())
+        if self._buffered:
+            frames.append(self._buffered_table(slice(-n, None)).to_pandas())
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def aggregates(self) -> pd.DataFrame:
+        """Return the summary of every scoring function over the rows written so far."""
+        summary = []
+        for fn in self.scoring_functions:
+            stats = self._stats[fn]
+            summary.append(
+                {
+                    "scoring_function": fn,
+                    "rows": stats["rows"],
+                    "scored": stats["scored"],
+                    "mean": stats["sum"] / stats["scored"] if stats["min"] is not None else None,
+                    "min": stats["min"],
+                    "max": stats["max"],
+                    "distribution": dict(self._distributions[fn].most_common()) or None,
+                }
+            )
+        return pd.DataFrame(summary).set_index("scoring_function")
+
+    def finish(self) -> str | None:
+        """Merge the chunks into one Parquet file; returns its path, or None if no rows were added."""
+        self._flush()
+        if not self._chunks:
+            return None
+        self.schema = pa.schema(list(self._types.items()))
+        with pq.ParquetWriter(self.path, self.schema) as writer:
+            for table in self._merged_chunks():
+                writer.write_table(table)
+        for chunk in self._chunks:
+            os.remove(chunk["path"])
+        self._chunks = []
+        return self.path
+
+    def _merged_chunks(self):
+        """Yield the rows of every chunk under the widened schema, in ``row`` order when every row has one.
+
+        Rows are sorted ``chunk_rows`` positions at a time. They are written as
+        they complete, which is close to dataset order, so each range is read
+        from only the few chunks whose row range overlaps it.
+        """
+        if any(chunk["row_range"] is None for chunk in self._chunks):
+            for chunk in self._chunks:
+                yield _conform(pq.read_table(chunk["path"]), self.schema)
+            return
+        positions = np.unique(
+            np.concatenate(
+                [pq.read_table(chunk["path"], columns=[ROW_COLUMN])[ROW_COLUMN].to_numpy() for chunk in self._chunks]
+            )
+        )
+        for start in range(0, len(positions), self.chunk_rows):
+            low, high = positions[start], positions[min(start + self.chunk_rows, len(positions)) - 1]
+            tables = [
+                _conform(
+                    pq.read_table(chunk["path"], filters=[(ROW_COLUMN, ">=", low), (ROW_COLUMN, "<=", high)]),
+                    self.schema,
+                )
+                for chunk in self._chunks
+                if chunk["row_range"]["min"] <= high and chunk["row_range"]["max"] >= low
+            ]
+            yield pa.concat_tables(tables).sort_by(ROW_COLUMN)
+
+    def head(self, n: int) -> pd.DataFrame:
+        """Read the first ``n`` rows back from the finished Parquet file."""
+        if n <= 0 or not os.path.exists(self.path):
+            return pd.DataFrame()
+        batches = []
+        rows = 0
+        for batch in pq.ParquetFile(self.path).iter_batches(batch_size=min(n, self.chunk_rows)):
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= n:
+                break
+        return pa.Table.from_batches(batches).slice(0, n).to_pandas()
+
+
+def show_results(builder: ResultTableBuilder) -> None:
+    """Finish a result table and show its aggregates, a preview and a Parquet download."""
+    path = builder.finish()
+    if path is None:
+        return
+    st.subheader("Evaluation Results")
+    st.dataframe(builder.aggregates())
+    st.dataframe(builder.head(RESULTS_PREVIEW_ROWS))
+    st.caption(f"Showing {min(builder.num_rows, RESULTS_PREVIEW_ROWS)} of {builder.num_rows} rows, saved to {path}")
+    with open(path, "rb") as f:
+        st.download_button(
+            "Download Results (Parquet)",
+            data=f,
+            file_name=os.path.basename(path),
+            mime="application/vnd.apache.parquet",
+        )
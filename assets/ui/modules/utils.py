@@ -7,30 +7,115 @@
 import base64
 import os
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 
+# Rows parsed at a time from uploaded datasets
+DATASET_CHUNK_ROWS = int(os.environ.get("DATASET_CHUNK_ROWS", "10000"))
+
+# Rows randomly sampled from an uploaded dataset for its preview
+DATASET_PREVIEW_ROWS = 100
+
+
+class StreamingDataset:
+    """A CSV or Excel dataset read chunk by chunk instead of into one DataFrame.
+
+    Opening the dataset makes a single pass to count its rows and draw a uniform
+    random sample for the preview; rows are then parsed again lazily, so no more
+    than one chunk of the file is held as a DataFrame at a time.
+    """
+
+    def __init__(self, file, chunk_rows: int = DATASET_CHUNK_ROWS, preview_rows: int = DATASET_PREVIEW_ROWS):
+        self.file = file
+        self.chunk_rows = chunk_rows
+        self.file_ext = os.path.splitext(file.name)[1].lower()
+        if self.file_ext not in [".csv", ".xlsx", ".xls"]:
+            raise ValueError("Unsupported file format. Please upload a CSV or Excel file.")
+        self.num_rows, self.columns, self.preview = self._scan(preview_rows)
+
+    def _scan(self, preview_rows: int):
+        # Bottom-k sampling: keep the rows with the smallest random keys seen so far
+        rng = np.random.default_rng()
+        num_rows, columns = 0, []
+        sample, sample_keys = None, np.empty(0)
+        for chunk in self.iter_chunks():
+            num_rows += len(chunk)
+            columns = list(chunk.columns)
+            candidates = chunk if sample is None else pd.concat([sample, chunk])
+            keys = np.concatenate([sample_keys, rng.random(len(chunk))])
+            keep = np.argsort(keys)[:preview_rows]
+            sample, sample_keys = candidates.iloc[keep], keys[keep]
+        preview = sample.sort_index() if sample is not None else pd.DataFrame()
+        return num_rows, columns, preview
+
+    def iter_chunks(self):
+        """Yield the dataset as DataFrames of at most ``chunk_rows`` rows, indexed by row number."""
+        self.file.seek(0)
+        if self.file_ext == ".csv":
+            yield from pd.read_csv(self.file, chunksize=self.chunk_rows)
+        elif self.file_ext == ".xlsx":
+            yield from self._iter_xlsx_chunks()
+        else:
+            # The legacy .xls format can't be streamed
+            df = pd.read_excel(self.file)
+            for start in range(0, len(df), self.chunk_rows):
+                yield df.iloc[start : start + self.chunk_rows]
+
+    def _iter_xlsx_chunks(self):
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(self.file, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [name if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+            start, batch = 0, []
+            for values in rows:
+                if all(value is None for value in values):
+                    continue
+                batch.append(values)
+                if len(batch) == self.chunk_rows:
+                    yield pd.DataFrame(batch, columns=columns, index=range(start, start + len(batch)))
+                    start, batch = start + len(batch), []
+            if batch:
+                yield pd.DataFrame(batch, columns=columns, index=range(start, start + len(batch)))
+        finally:
+            workbook.close()
+
+    def iter_row_batches(self, limit: int | None = None):
+        """Yield ``(start, rows)`` with the rows of each chunk as dicts, up to ``limit`` rows in total."""
+        start = 0
+        for chunk in self.iter_chunks():
+            if limit is not None:
+                chunk = chunk.iloc[: limit - start]
+            if chunk.empty:
+                return
+            yield start, chunk.to_dict(orient="records")
+            start += len(chunk)
+
+
 def process_dataset(file):
     if file is None:
         return "No file uploaded", None
 
-    try:
-        # Determine file type and read accordingly
-        file_ext = os.path.splitext(file.name)[1].lower()
-        if file_ext == ".csv":
-            df = pd.read_csv(file)
-        elif file_ext in [".xlsx", ".xls"]:
-            df = pd.read_excel(file)
-        else:
-            return "Unsupported file format. Please upload a CSV or Excel file.", None
-
-        return df
+    # Reruns of the page reuse the scan of the current upload
+    cached = st.session_state.get("processed_dataset")
+    if cached is not None and cached[0] == file.file_id:
+        return cached[1]
 
+    try:
+        dataset = StreamingDataset(file)
     except Exception as e:
         st.error(f"Error processing file: {str(e)}")
         return None
 
+    st.session_state["processed_dataset"] = (file.file_id, dataset)
+    return dataset
+
 
 def data_url_from_file(file) -> str:
     file_content = file.getvalue()
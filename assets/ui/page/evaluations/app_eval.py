@@ -6,11 +6,12 @@
 
 import json
 
-import pandas as pd
 import streamlit as st
 
-from llama_stack.distribution.ui.modules.api import llama_stack_api
-from llama_stack.distribution.ui.modules.utils import process_dataset
+from modules.api import llama_stack_api
+from modules.utils import process_dataset
+from modules.eval_cache import eval_result_cache_error, get_eval_result_cache, result_key
+from modules.results import RESULTS_LIVE_ROWS, ResultTableBuilder, show_results
 
 
 def application_evaluation_page():
@@ -25,17 +26,21 @@ def application_evaluation_page():
         return
 
     # Process uploaded file
-    df = process_dataset(uploaded_file)
-    if df is None:
+    dataset = process_dataset(uploaded_file)
+    if dataset is None:
         st.error("Error processing file")
         return
+    if dataset.num_rows == 0:
+        st.error("The dataset has no rows")
+        return
 
     # Display dataset information
     st.success("Dataset loaded successfully!")
 
     # Display dataframe preview
     st.subheader("Dataset Preview")
-    st.dataframe(df)
+    st.dataframe(dataset.preview)
+    st.caption(f"Random sample of {len(dataset.preview)} of {dataset.num_rows} rows")
 
     # Select Scoring Functions to Run Evaluation On
     st.subheader("Select Scoring Functions")
@@ -88,56 +93,65 @@ def application_evaluation_page():
             scoring_params[scoring_fn_id] = new_params
 
         # Add run evaluation button & slider
-        total_rows = len(df)
+        total_rows = dataset.num_rows
         num_rows = st.slider("Number of rows to evaluate", 1, total_rows, total_rows)
 
+        # Scores are cached keyed on the scoring functions, their params and the row
+        eval_result_cache = get_eval_result_cache()
+        if eval_result_cache is None:
+            st.warning(f"Scores are not cached: the result cache could not be opened ({eval_result_cache_error()})")
+            use_cache = False
+        else:
+            use_cache = st.checkbox(
+                "Reuse cached scores",
+                value=True,
+                help="Serve rows already scored with these scoring functions and params from the local cache. "
+                "When unchecked, every row is scored again and its cached result replaced.",
+            )
+            if st.button("Purge Cached Scores"):
+                purged = eval_result_cache.purge("scoring")
+                st.success(f"Purged {purged} cached scores")
+            st.caption(f"{eval_result_cache.count('scoring')} cached scores")
+
         if st.button("Run Evaluation"):
             progress_text = "Running evaluation..."
             progress_bar = st.progress(0, text=progress_text)
-            rows = df.to_dict(orient="records")
-            if num_rows < total_rows:
-                rows = rows[:num_rows]
-
             # Create separate containers for progress text and results
             progress_text_container = st.empty()
             results_container = st.empty()
-            output_res = {}
-            for i, r in enumerate(rows):
-                # Update progress
-                progress = i / len(rows)
-                progress_bar.progress(progress, text=progress_text)
-
-                # Run evaluation for current row
-                score_res = llama_stack_api.run_scoring(
-                    r,
+
+            # Rows are read and scored one dataset chunk at a time, cached rows first within each chunk
+            results = ResultTableBuilder(selected_scoring_functions)
+            for start, rows in dataset.iter_row_batches(limit=num_rows):
+                keys = [result_key(selected_scoring_functions, scoring_params, r) for r in rows]
+                cached = eval_result_cache.get_many(keys) if use_cache else {}
+                reused = 0
+                for i, (r, key) in enumerate(zip(rows, keys)):
+                    if key in cached:
+                        results.append({"row": start + i, **r, **cached[key]})
+                        reused += 1
+                if reused:
+                    progress_bar.progress(results.num_rows / num_rows, text=progress_text)
+                    progress_text_container.write(f"Reused {reused} cached rows ({results.num_rows} / {num_rows})")
+                    results_container.dataframe(results.tail(RESULTS_LIVE_ROWS))
+
+                # Score the remaining rows in concurrent batches; results come back as they complete
+                pending = [i for i, key in enumerate(keys) if key not in cached]
+                for j, r, row_scores in llama_stack_api.iter_score_rows(
+                    [rows[i] for i in pending],
                     scoring_function_ids=selected_scoring_functions,
                     scoring_params=scoring_params,
-                )
-
-                for k in r.keys():
-                    if k not in output_res:
-                        output_res[k] = []
-                    output_res[k].append(r[k])
-
-                for fn_id in selected_scoring_functions:
-                    if fn_id not in output_res:
-                        output_res[fn_id] = []
-                    output_res[fn_id].append(score_res.results[fn_id].score_rows[0])
-
-                # Display current row results using separate containers
-                progress_text_container.write(f"Expand to see current processed result ({i + 1} / {len(rows)})")
-                results_container.json(
-                    score_res.to_json(),
-                    expanded=2,
-                )
+                ):
+                    i = pending[j]
+                    if eval_result_cache is not None:
+                        eval_result_cache.put(keys[i], "scoring", row_scores)
+                    results.append({"row": start + i, **r, **row_scores})
+                    progress_bar.progress(results.num_rows / num_rows, text=progress_text)
+                    progress_text_container.write(f"Processed {results.num_rows} / {num_rows} rows, latest below")
+                    results_container.dataframe(results.tail(RESULTS_LIVE_ROWS))
 
             progress_bar.progress(1.0, text="Evaluation complete!")
-
-            # Display results in dataframe
-            if output_res:
-                output_df = pd.DataFrame(output_res)
-                st.subheader("Evaluation Results")
-                st.dataframe(output_df)
+            show_results(results)
 
 
 application_evaluation_page()
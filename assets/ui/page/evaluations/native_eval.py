@@ -6,10 +6,11 @@
 
 import json
 
-import pandas as pd
 import streamlit as st
 
-from llama_stack.distribution.ui.modules.api import llama_stack_api
+from modules.api import EVAL_BATCH_SIZE, EVAL_MAX_WORKERS, llama_stack_api
+from modules.eval_cache import eval_result_cache_error, get_eval_result_cache, result_key
+from modules.results import RESULTS_LIVE_ROWS, ResultTableBuilder, show_results
 
 
 def select_benchmark_1():
@@ -179,6 +180,18 @@ def run_evaluation_3():
         value=5,
         help="Number of examples from the dataset to evaluate. ",
     )
+    batch_size = st.number_input(
+        "Batch Size",
+        min_value=1,
+        value=EVAL_BATCH_SIZE,
+        help="Number of examples sent in each evaluation request.",
+    )
+    max_workers = st.number_input(
+        "Concurrent Requests",
+        min_value=1,
+        value=EVAL_MAX_WORKERS,
+        help="Number of evaluation requests running at the same time.",
+    )
 
     benchmark_config = {
         "type": "benchmark",
@@ -191,6 +204,24 @@ def run_evaluation_3():
     with st.expander("View Evaluation Task Configuration", expanded=True):
         st.json(benchmark_config, expanded=True)
 
+    # Results are cached per benchmark, keyed on the configuration and the row
+    cache_namespace = f"eval:{selected_benchmark}"
+    eval_result_cache = get_eval_result_cache()
+    if eval_result_cache is None:
+        st.warning(f"Results are not cached: the result cache could not be opened ({eval_result_cache_error()})")
+        use_cache = False
+    else:
+        use_cache = st.checkbox(
+            "Reuse cached results",
+            value=True,
+            help="Serve examples already evaluated with this configuration from the local cache. "
+            "When unchecked, every example is evaluated again and its cached result replaced.",
+        )
+        if st.button("Purge Cached Results"):
+            purged = eval_result_cache.purge(cache_namespace)
+            st.success(f"Purged {purged} cached results for {selected_benchmark}")
+        st.caption(f"{eval_result_cache.count(cache_namespace)} cached results for this eval task")
+
     # Add run button and handle evaluation
     if st.button("Run Evaluation"):
         progress_text = "Running evaluation..."
@@ -202,43 +233,39 @@ def run_evaluation_3():
         # Create separate containers for progress text and results
         progress_text_container = st.empty()
         results_container = st.empty()
-        output_res = {}
-        for i, r in enumerate(rows):
-            # Update progress
-            progress = i / len(rows)
-            progress_bar.progress(progress, text=progress_text)
-            # Run evaluation for current row
-            eval_res = llama_stack_api.client.eval.evaluate_rows(
-                benchmark_id=selected_benchmark,
-                input_rows=[r],
-                scoring_functions=benchmarks[selected_benchmark].scoring_functions,
-                benchmark_config=benchmark_config,
-            )
-
-            for k in r.keys():
-                if k not in output_res:
-                    output_res[k] = []
-                output_res[k].append(r[k])
-
-            for k in eval_res.generations[0].keys():
-                if k not in output_res:
-                    output_res[k] = []
-                output_res[k].append(eval_res.generations[0][k])
+        scoring_functions = benchmarks[selected_benchmark].scoring_functions
+        keys = [result_key(selected_benchmark, benchmark_config, scoring_functions, r) for r in rows]
+        cached = eval_result_cache.get_many(keys) if use_cache else {}
+        # Cached rows first, then rows in the order they complete
+        results = ResultTableBuilder(scoring_functions)
+        for i, (r, key) in enumerate(zip(rows, keys)):
+            if key in cached:
+                results.append({"row": i, **r, **cached[key]["generation"], **cached[key]["scores"]})
+        if results.num_rows:
+            progress_bar.progress(results.num_rows / len(rows), text=progress_text)
+            progress_text_container.write(f"Reused {results.num_rows} / {len(rows)} cached examples")
+            results_container.dataframe(results.tail(RESULTS_LIVE_ROWS))
 
-            for scoring_fn in benchmarks[selected_benchmark].scoring_functions:
-                if scoring_fn not in output_res:
-                    output_res[scoring_fn] = []
-                output_res[scoring_fn].append(eval_res.scores[scoring_fn].score_rows[0])
+        pending = [i for i, key in enumerate(keys) if key not in cached]
+        for j, r, generation, scores in llama_stack_api.iter_evaluate_rows(
+            benchmark_id=selected_benchmark,
+            rows=[rows[i] for i in pending],
+            scoring_functions=scoring_functions,
+            benchmark_config=benchmark_config,
+            batch_size=int(batch_size),
+            max_workers=int(max_workers),
+        ):
+            i = pending[j]
+            if eval_result_cache is not None:
+                eval_result_cache.put(keys[i], cache_namespace, {"generation": generation, "scores": scores})
+            results.append({"row": i, **r, **generation, **scores})
 
-            progress_text_container.write(f"Expand to see current processed result ({i + 1} / {len(rows)})")
-            results_container.json(eval_res, expanded=2)
+            progress_bar.progress(results.num_rows / len(rows), text=progress_text)
+            progress_text_container.write(f"Processed {results.num_rows} / {len(rows)} examples, latest below")
+            results_container.dataframe(results.tail(RESULTS_LIVE_ROWS))
 
         progress_bar.progress(1.0, text="Evaluation complete!")
-        # Display results in dataframe
-        if output_res:
-            output_df = pd.DataFrame(output_res)
-            st.subheader("Evaluation Results")
-            st.dataframe(output_df)
+        show_results(results)
 
 
 def native_evaluation_page():
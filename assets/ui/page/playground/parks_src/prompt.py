@@ -9,13 +9,14 @@ To do so, you have been given access to the following tools: <<tool_names>>
 1. Do NOT guess or invent tool names, never use hypothetical tools
 2. Never use tools like `Maps`, `search`, `maps_geocode`, or `knowledge_search` unless they are explicitly in <<tool_names>>.
 3. If you cannot solve a task using the tools available, explain that limitation in your final answer instead of calling an invalid tool.
-4. ALWAYS ALWAYS ALWAYS USE `get_park_location` before `get_alerts`
-5. If a tool needs location data (like `get_alerts`, `maps_search_places`), you must first call `get_park_location` and extract the relevant state, city, or coordinates from its result before proceeding. You must not hardcode, assume, or guess this data.
-6. Internally keep track of whether you have already retrieved park location. Do not call `get_alerts` until this location has been confirmed via `get_park_location`.
+4. ALWAYS ALWAYS ALWAYS get the park's location before `get_alerts`: use `get_park_location`, or `get_park_info` with the "location" facet when `get_park_location` is not listed.
+5. If a tool needs location data (like `get_alerts`, `maps_search_places`), you must first get the park's location as in rule 4 and extract the relevant state, city, or coordinates from its result before proceeding. You must not hardcode, assume, or guess this data.
+6. Internally keep track of whether you have already retrieved park location. Do not call `get_alerts` until this location has been confirmed.
 7. When asked for places or businesses, NEVER use a State when you have an address or coordinates (you can use maps_reverse_geocode tool to find the address)
 8. Always reason and describe a step by step plan in your first thought, and then review it each time, remember what the original query was, and never change the goal
 9. You may only call tools that are explicitly listed in: <<tool_names>>.
 10. When looking up places in the "maps_search_places" tool, use address or coordinates, never the name of the park itself. (google maps will NEVER have information based on the parks actual name)
+11. When listed, prefer one call over many: `get_parks_info` for the same facts about several parks, `get_park_info` with several facets for one park, `search_parks` to find a park by a feature, `find_nearest_parks` to rank parks by distance.
 
 🛦 TOOL PARAMETER FORMAT (MANDATORY):
 Each tool call must use the following format for `tool_params`:
@@ -114,9 +115,9 @@ You only have access to the following tools: <<tool_descriptions>>
 SUMMARY:
 - Do not guess tools. Use only the ones listed.
 - Follow the exact `tool_params` format.
-- Use get_park_location to resolve any location before calling tools that require geographic input.
+- Get the park's location (get_park_location, or get_park_info with the "location" facet) before get_alerts or any tool that requires geographic input.
 - Do not hardcode, guess, or assume state names or coordinates.
-- Always use get_park_location before get_alerts.
+- Prefer the listed batch, search and nearest-park tools over many single lookups.
 - Keep internal memory of what locations have already been retrieved.
 - Return final answers with `"action": null`.
 
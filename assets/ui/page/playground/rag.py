@@ -7,11 +7,11 @@
 import uuid
 
 import streamlit as st
-from llama_stack_client import Agent, AgentEventLogger, RAGDocument
+from llama_stack_client import Agent, AgentEventLogger
 
 from llama_stack.apis.common.content_types import ToolCallDelta
-from llama_stack.distribution.ui.modules.api import llama_stack_api
-from llama_stack.distribution.ui.modules.utils import data_url_from_file
+from modules.api import llama_stack_api
+from modules.ingest import CollectionIngestionManager, collection_name, collection_vector_db_ids
 
 
 def rag_chat_page():
@@ -49,14 +49,6 @@ def rag_chat_page():
                 help="Enter a unique identifier for this document collection",
             )
             if st.button("Create Document Collection"):
-                documents = [
-                    RAGDocument(
-                        document_id=uploaded_file.name,
-                        content=data_url_from_file(uploaded_file),
-                    )
-                    for i, uploaded_file in enumerate(uploaded_files)
-                ]
-
                 providers = llama_stack_api.client.providers.list()
                 vector_io_provider = None
 
@@ -64,20 +56,22 @@ def rag_chat_page():
                     if x.api == "vector_io":
                         vector_io_provider = x.provider_id
 
-                llama_stack_api.client.vector_dbs.register(
-                    vector_db_id=vector_db_name,  # Use the user-provided name
-                    embedding_dimension=384,
-                    embedding_model="all-MiniLM-L6-v2",
+                # Only new or changed files are embedded; a changed file replaces its stale chunks
+                ingestion = CollectionIngestionManager(
+                    llama_stack_api.client,
+                    collection=vector_db_name,  # Use the user-provided name
                     provider_id=vector_io_provider,
                 )
-
-                # insert documents using the custom vector db name
-                llama_stack_api.client.tool_runtime.rag_tool.insert(
-                    vector_db_id=vector_db_name,  # Use the user-provided name
-                    documents=documents,
-                    chunk_size_in_tokens=512,
+                summary = ingestion.sync(uploaded_files, chunk_size_in_tokens=512)
+                st.success(
+                    f"Vector database updated: {len(summary['added'])} added, "
+                    f"{len(summary['updated'])} updated, {len(summary['unchanged'])} unchanged"
                 )
-                st.success("Vector database created successfully!")
+                if ingestion.manifest_error is not None:
+                    st.warning(
+                        f"Ingested files are not tracked, so they will be embedded again on the next upload: "
+                        f"the manifest could not be saved ({ingestion.manifest_error})"
+                    )
 
         st.subheader("RAG Parameters", divider=True)
 
@@ -95,12 +89,14 @@ def rag_chat_page():
         # select memory banks
         vector_dbs = llama_stack_api.client.vector_dbs.list()
         vector_dbs = [vector_db.identifier for vector_db in vector_dbs]
-        selected_vector_dbs = st.multiselect(
+        selected_collections = st.multiselect(
             label="Select Document Collections to use in RAG queries",
-            options=vector_dbs,
+            options=sorted({collection_name(vector_db) for vector_db in vector_dbs}),
             on_change=reset_agent_and_chat,
             disabled=should_disable_input(),
         )
+        # Each collection is stored as one vector DB per document
+        selected_vector_dbs = collection_vector_db_ids(vector_dbs, selected_collections)
 
         st.subheader("Inference Parameters", divider=True)
         available_models = llama_stack_api.client.models.list()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The UI imports its helpers as top-level "modules", as streamlit runs app.py from assets/ui
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,46 @@
+import io
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from modules.results import ResultTableBuilder
+
+
+def _finish(rows, tmp_path, chunk_rows=2):
+    builder = ResultTableBuilder(["judge"], spill_dir=str(tmp_path), chunk_rows=chunk_rows)
+    for row in rows:
+        builder.append(row)
+    return pq.read_table(builder.finish())
+
+
+def test_missing_first_cell_keeps_later_strings(tmp_path):
+    # The empty first cell is read as NaN, which must not make the column numeric
+    dataset = pd.read_csv(io.StringIO("question,context\nq1,\nq2,ctx two\nq3,ctx three\n"))
+    rows = [{"row": i, **r, "judge": {"score": 1}} for i, r in enumerate(dataset.to_dict("records"))]
+
+    table = _finish(rows, tmp_path)
+
+    assert table["context"].to_pylist() == [None, "ctx two", "ctx three"]
+
+
+def test_columns_widen_across_chunks(tmp_path):
+    rows = [
+        {"row": 0, "judge": {"score": 1}},
+        {"row": 1, "judge": {"score": 0}},
+        {"row": 2, "judge": {"score": 0.5}},
+        {"row": 3, "judge": {"score": "A", "rationale": "late key"}},
+    ]
+
+    table = _finish(rows, tmp_path)
+
+    assert table["judge.score"].to_pylist() == ["1", "0", "0.5", "A"]
+    assert table["judge.rationale"].to_pylist() == [None, None, None, "late key"]
+
+
+def test_rows_are_saved_in_dataset_order(tmp_path):
+    rows = [{"row": i, "judge": {"score": i / 10}} for i in (3, 0, 4, 1, 2)]
+
+    table = _finish(rows, tmp_path)
+
+    assert table["row"].to_pylist() == [0, 1, 2, 3, 4]
+    assert table["judge.score"].to_pylist() == [0.0, 0.1, 0.2, 0.3, 0.4]
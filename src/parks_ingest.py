@@ -0,0 +1,224 @@
+import hashlib
+import importlib.util
+import json
+import os
+
+from llama_stack_client import LlamaStackClient
+
+# The section splitter, facet map and partition naming are shared with the MCP
+# server, which ships in its own image, so its modules are loaded by path
+_MCP_SERVER_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "mcp_servers", "mcp-parks-info"
+)
+
+
+def _load_server_module(name: str):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(_MCP_SERVER_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+park_sections = _load_server_module("park_sections")
+partitions = _load_server_module("partitions")
+
+
+def _estimate_tokens(text: str) -> int:
+    # Roughly 4 characters per token for English text
+    return max(1, len(text) // 4)
+
+
+def chunk_park_document(markdown: str, document_id: str) -> list[dict]:
+    """
+    Split a park markdown document into one chunk per section, with every
+    table emitted as its own chunk.
+
+    Args:
+        markdown: The content of a park document.
+        document_id: Identifier of the document the chunks come from.
+
+    Returns:
+        A list of chunks ready for client.vector_io.insert. Every chunk starts with
+        the park title and section heading and carries park, section and facet metadata.
+    """
+    park, sections = park_sections.split_sections(markdown)
+    chunks = []
+    for heading, section_body in sections:
+        for kind, body in park_sections.split_blocks(section_body):
+            content = f"# {park}\n## {heading}\n{body}"
+            metadata = {
+                "document_id": document_id,
+                "park": park,
+                "section": heading,
+                "facet": park_sections.section_facet(heading),
+                "block": kind,
+            }
+            metadata["token_count"] = _estimate_tokens(content)
+            metadata["metadata_token_count"] = _estimate_tokens(str(metadata))
+            chunks.append({"content": content, "metadata": metadata})
+    return chunks
+
+
+def chunk_park_directory(document_directory: str, files: list[str] | None = None) -> list[dict]:
+    """
+    Chunk every markdown document in a directory.
+    """
+    if files is None:
+        files = sorted(f for f in os.listdir(document_directory) if f.endswith(".md"))
+    chunks = []
+    for file in files:
+        with open(os.path.join(document_directory, file), "r", encoding="utf-8") as f:
+            chunks.extend(chunk_park_document(f.read(), document_id=file))
+    return chunks
+
+
+def ingest_parks(client: LlamaStackClient, vector_db_id: str, document_directory: str, files: list[str] | None = None) -> list[dict]:
+    """
+    Insert section-aware chunks of the Parks documents into a vector DB.
+
+    Unlike rag_tool.insert, which splits documents by token count, this keeps
+    each section and each table whole, so a tool like get_park_cost can
+    retrieve the single fees table instead of two mixed chunks.
+
+    Returns:
+        The inserted chunks.
+    """
+    chunks = chunk_park_directory(document_directory, files)
+    client.vector_io.insert(vector_db_id=vector_db_id, chunks=chunks)
+    return chunks
+
+
+def content_hash(content: str) -> str:
+    """
+    Return the SHA-256 hex digest identifying a version of a document.
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def partition_vector_db_ids(client: LlamaStackClient, vector_db_id: str) -> list[str]:
+    """
+    Return the ids of the per-document vector DBs making up a collection.
+    """
+    return sorted(
+        db.identifier
+        for db in client.vector_dbs.list()
+        if db.identifier != vector_db_id and partitions.collection_name(db.identifier) == vector_db_id
+    )
+
+
+class ParkIngestionManager:
+    """
+    Incrementally keep a vector DB collection in sync with a directory of park documents.
+
+    Every document is stored in its own vector DB, "<vector_db_id>--<document stem>-<hash>",
+    because chunks cannot be deleted from a vector DB one by one. A JSON manifest
+    records the content hash ingested for each document, so a re-run embeds only
+    new or changed documents, and drops the vector DBs of changed or removed ones
+    together with all their stale chunks.
+    """
+
+    def __init__(
+        self,
+        client: LlamaStackClient,
+        vector_db_id: str,
+        provider_id: str,
+        manifest_path: str,
+        embedding_model: str = "all-MiniLM-L6-v2",
+        embedding_dimension: int = 384,
+    ):
+        self.client = client
+        self.vector_db_id = vector_db_id
+        self.provider_id = provider_id
+        self.manifest_path = manifest_path
+        self.embedding_model = embedding_model
+        self.embedding_dimension = embedding_dimension
+
+    def partition_id(self, document_id: str) -> str:
+        return partitions.partition_id(self.vector_db_id, document_id)
+
+    def legacy_partition_id(self, document_id: str) -> str:
+        # Earlier versions named partitions after the document stem alone
+        return self.vector_db_id + partitions.PARTITION_SEPARATOR + os.path.splitext(document_id)[0]
+
+    def load_manifest(self) -> dict:
+        """
+        Return the ingested {document_id: content hash} entries, or {} if there is no manifest yet.
+        """
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("documents", {})
+
+    def save_manifest(self, documents: dict) -> None:
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"vector_db_id": self.vector_db_id, "documents": documents}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def sync(self, document_directory: str, files: list[str] | None = None) -> dict:
+        """
+        Bring the collection in line with the documents in a directory.
+
+        Args:
+            document_directory: Directory holding the park markdown documents.
+            files: The documents making up the collection. Defaults to every .md file;
+                previously ingested documents that are not listed are removed.
+
+        Returns:
+            A summary with the "added", "updated", "removed" and "unchanged" document ids
+            and the number of "chunks" inserted.
+        """
+        if files is None:
+            files = sorted(f for f in os.listdir(document_directory) if f.endswith(".md"))
+        partition_files = {}
+        for file in files:
+            other = partition_files.setdefault(self.partition_id(file), file)
+            if other != file:
+                raise ValueError(f"Documents {other} and {file} map to the same vector DB {self.partition_id(file)}")
+        manifest = self.load_manifest()
+        registered = {db.identifier for db in self.client.vector_dbs.list()}
+        summary = {"added": [], "updated": [], "removed": [], "unchanged": [], "chunks": 0}
+
+        # A collection ingested whole by an earlier version holds every document's chunks
+        if self.vector_db_id in registered:
+            self.client.vector_dbs.unregister(vector_db_id=self.vector_db_id)
+
+        for file in files:
+            with open(os.path.join(document_directory, file), "r", encoding="utf-8") as f:
+                markdown = f.read()
+            digest = content_hash(markdown)
+            partition_id = self.partition_id(file)
+            if manifest.get(file) == digest and partition_id in registered:
+                summary["unchanged"].append(file)
+                continue
+            if partition_id in registered:
+                self.client.vector_dbs.unregister(vector_db_id=partition_id)
+            self.client.vector_dbs.register(
+                vector_db_id=partition_id,
+                embedding_model=self.embedding_model,
+                embedding_dimension=self.embedding_dimension,
+                provider_id=self.provider_id,
+            )
+            chunks = chunk_park_document(markdown, document_id=file)
+            for chunk in chunks:
+                chunk["metadata"]["content_hash"] = digest
+                chunk["metadata"]["metadata_token_count"] = _estimate_tokens(str(chunk["metadata"]))
+            self.client.vector_io.insert(vector_db_id=partition_id, chunks=chunks)
+            summary["updated" if file in manifest else "added"].append(file)
+            summary["chunks"] += len(chunks)
+            manifest[file] = digest
+            # Saved after every document so an interrupted run resumes where it stopped
+            self.save_manifest(manifest)
+
+        for file in sorted(set(manifest) - set(files)):
+            partition_id = self.partition_id(file)
+            if partition_id in registered:
+                self.client.vector_dbs.unregister(vector_db_id=partition_id)
+            del manifest[file]
+            summary["removed"].append(file)
+        for file in sorted(set(manifest) | set(files)):
+            legacy_id = self.legacy_partition_id(file)
+            if legacy_id in registered and legacy_id not in partition_files:
+                self.client.vector_dbs.unregister(vector_db_id=legacy_id)
+        self.save_manifest(manifest)
+        return summary